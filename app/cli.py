@@ -1,21 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    from app.workflow.runner import RunnerOptions
+
+# Тяжёлые зависимости (Rich, раннер, pydantic-конфиги) импортируются внутри команд,
+# чтобы `--help` и разбор аргументов не тянули весь стек приложения.
+CLI_DESCRIPTION = "Гибкий агент сбора ссылок товаров из категорий сайтов."
+_NEXT_RUN_MESSAGE = "Следующий запуск через {:.0f} секунд"
+
+
+def _existing_file(value: str) -> Path:
+    path = Path(value)
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(f"Файл '{value}' не найден")
+    if not os.access(path, os.R_OK):
+        raise argparse.ArgumentTypeError(f"Файл '{value}' недоступен для чтения")
+    return path
+
+
+def _existing_dir(value: str) -> Path:
+    path = Path(value)
+    if not path.is_dir():
+        raise argparse.ArgumentTypeError(f"Каталог '{value}' не найден")
+    if not os.access(path, os.R_OK):
+        raise argparse.ArgumentTypeError(f"Каталог '{value}' недоступен для чтения")
+    return path
+
+
+def _non_negative_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Ожидается число, получено '{value}'") from exc
+    if number < 0:
+        raise argparse.ArgumentTypeError("Значение должно быть не меньше 0")
+    return number
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Ожидается целое число, получено '{value}'") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError("Значение должно быть не меньше 1")
+    return number
+
 
-import typer
-from rich.console import Console
+def _env_default(name: str) -> str | None:
+    return os.getenv(name) or None
+
+
+def _common_args_parser() -> argparse.ArgumentParser:
+    """Строит родительский парсер с общими опциями `run`/`watch` (один раз на сборку CLI)."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--config",
+        "-c",
+        dest="config_path",
+        type=_existing_file,
+        default=None,
+        help="Путь к общей конфигурации запуска (YAML/JSON). "
+        "Если не указан, используется конфигурация из переменных окружения "
+        "[env: GLOBAL_CONFIG_PATH].",
+    )
+    parser.add_argument(
+        "--sites-dir",
+        type=_existing_dir,
+        default=None,
+        help="Каталог с конфигурациями сайтов [env: SITE_CONFIG_DIR].",
+    )
+    parser.add_argument(
+        "--log-level",
+        default=None,
+        help="Уровень логирования (DEBUG/INFO/WARNING/ERROR/CRITICAL). "
+        "Можно задать через переменную окружения LOG_LEVEL.",
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Продолжать с учётом сохранённого state.",
+    )
+    parser.add_argument(
+        "--reset-state",
+        action="store_true",
+        help="Перед запуском стереть локальное состояние.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Выполнить обход без записи данных в Google Sheets.",
+    )
+    return parser
+
+
+@lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Собирает argparse-парсер с командами `run` и `watch` один раз за процесс.
+
+    Парсер не зависит от окружения: значения из переменных подставляет `parse_args`,
+    поэтому закешированный экземпляр безопасно переиспользовать.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.main", description=CLI_DESCRIPTION)
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    common = _common_args_parser()
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Единичный запуск агента.",
+        description="Точка входа для единичного запуска агента.",
+        parents=[common],
+    )
+    run_parser.add_argument(
+        "--run-id",
+        default=None,
+        help="Идентификатор запуска (по умолчанию генерируется UUID4).",
+    )
+    run_parser.set_defaults(handler=run_agent)
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Непрерывный режим с автоматическим перезапуском.",
+        description="Непрерывный режим: перезапускает агента после завершения или ошибки.",
+        parents=[common],
+    )
+    watch_parser.add_argument(
+        "--success-delay",
+        type=_non_negative_float,
+        default=300.0,
+        help="Пауза между успешными циклами (секунды).",
+    )
+    watch_parser.add_argument(
+        "--error-delay",
+        type=_non_negative_float,
+        default=120.0,
+        help="Пауза перед повторным запуском после ошибки (секунды).",
+    )
+    watch_parser.add_argument(
+        "--max-runs",
+        type=_positive_int,
+        default=None,
+        help="Опциональный лимит числа итераций watch-режима.",
+    )
+    watch_parser.set_defaults(handler=watch_agent)
+    return parser
 
-from app.config.runtime_paths import resolve_str_path
-from app.logger import configure_logging, get_logger
-from app.workflow.runner import AgentRunner, RunnerOptions
 
-console = Console()
-cli = typer.Typer(help="Гибкий агент сбора ссылок товаров из категорий сайтов.")
-logger = get_logger(__name__)
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Разбирает аргументы и дополняет неуказанные опции значениями из окружения."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.config_path is None and (value := _env_default("GLOBAL_CONFIG_PATH")):
+            args.config_path = _existing_file(value)
+        if args.sites_dir is None and (value := _env_default("SITE_CONFIG_DIR")):
+            args.sites_dir = _existing_dir(value)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    if args.log_level is None:
+        args.log_level = _env_default("LOG_LEVEL") or "INFO"
+    return args
 
 
 def _resolve_sites_dir_cli(sites_dir: Optional[Path]) -> Path:
     if sites_dir is not None:
         return sites_dir
+    from app.config.runtime_paths import resolve_str_path
+
     return Path(
         resolve_str_path(
             "SITE_CONFIG_DIR",
@@ -34,6 +194,8 @@ def _build_runner_options(
     reset_state: bool,
     dry_run: bool,
 ) -> RunnerOptions:
+    from app.workflow.runner import RunnerOptions
+
     return RunnerOptions(
         config_path=config_path,
         sites_dir=sites_dir,
@@ -44,123 +206,46 @@ def _build_runner_options(
     )
 
 
-def _common_run_options() -> dict:
-    return dict(
-        config_path=typer.Option(
-            None,
-            "--config",
-            "-c",
-            exists=True,
-            file_okay=True,
-            dir_okay=False,
-            readable=True,
-            envvar="GLOBAL_CONFIG_PATH",
-            help="Путь к общей конфигурации запуска (YAML/JSON). "
-            "Если не указан, используется конфигурация из переменных окружения.",
-        ),
-        sites_dir=typer.Option(
-            None,
-            "--sites-dir",
-            exists=True,
-            file_okay=False,
-            dir_okay=True,
-            readable=True,
-            envvar="SITE_CONFIG_DIR",
-            help="Каталог с конфигурациями сайтов.",
-        ),
-        log_level=typer.Option(
-            "INFO",
-            "--log-level",
-            envvar="LOG_LEVEL",
-            help="Уровень логирования (DEBUG/INFO/WARNING/ERROR/CRITICAL). "
-            "Можно задать через переменную окружения LOG_LEVEL.",
-        ),
-        resume=typer.Option(
-            True,
-            "--resume/--no-resume",
-            help="Продолжать с учётом сохранённого state.",
-        ),
-        reset_state=typer.Option(
-            False,
-            "--reset-state",
-            help="Перед запуском стереть локальное состояние.",
-        ),
-        dry_run=typer.Option(
-            False,
-            "--dry-run",
-            help="Выполнить обход без записи данных в Google Sheets.",
-        ),
-    )
-
-
-@cli.command("run")
-def run_agent(
-    config_path: Optional[Path] = _common_run_options()["config_path"],
-    sites_dir: Optional[Path] = _common_run_options()["sites_dir"],
-    run_id: Optional[str] = typer.Option(
-        None,
-        "--run-id",
-        help="Идентификатор запуска (по умолчанию генерируется UUID4).",
-    ),
-    log_level: str = _common_run_options()["log_level"],
-    resume: bool = _common_run_options()["resume"],
-    reset_state: bool = _common_run_options()["reset_state"],
-    dry_run: bool = _common_run_options()["dry_run"],
-) -> None:
+def run_agent(args: argparse.Namespace) -> None:
     """Точка входа для единичного запуска агента."""
-    configure_logging(log_level.upper())  # type: ignore[arg-type]
-    sites_dir_path = _resolve_sites_dir_cli(sites_dir)
+    from app.logger import configure_logging, get_console
+    from app.workflow.runner import AgentRunner
+
+    configure_logging(args.log_level.upper())  # type: ignore[arg-type]
+    sites_dir_path = _resolve_sites_dir_cli(args.sites_dir)
     runner = AgentRunner()
     options = _build_runner_options(
-        config_path=config_path,
+        config_path=args.config_path,
         sites_dir=sites_dir_path,
-        run_id=run_id,
-        resume=resume,
-        reset_state=reset_state,
-        dry_run=dry_run,
+        run_id=args.run_id,
+        resume=args.resume,
+        reset_state=args.reset_state,
+        dry_run=args.dry_run,
     )
     runner.run(options)
-    console.print("[bold green]Запуск агента завершён[/bold green]")
-
-
-@cli.command("watch")
-def watch_agent(
-    config_path: Optional[Path] = _common_run_options()["config_path"],
-    sites_dir: Optional[Path] = _common_run_options()["sites_dir"],
-    log_level: str = _common_run_options()["log_level"],
-    resume: bool = _common_run_options()["resume"],
-    reset_state: bool = _common_run_options()["reset_state"],
-    dry_run: bool = _common_run_options()["dry_run"],
-    success_delay: float = typer.Option(
-        300.0,
-        "--success-delay",
-        min=0.0,
-        help="Пауза между успешными циклами (секунды).",
-    ),
-    error_delay: float = typer.Option(
-        120.0,
-        "--error-delay",
-        min=0.0,
-        help="Пауза перед повторным запуском после ошибки (секунды).",
-    ),
-    max_runs: Optional[int] = typer.Option(
-        None,
-        "--max-runs",
-        min=1,
-        help="Опциональный лимит числа итераций watch-режима.",
-    ),
-) -> None:
+    get_console().print("[bold green]Запуск агента завершён[/bold green]")
+
+
+def watch_agent(args: argparse.Namespace) -> None:
     """Непрерывный режим: перезапускает агента после завершения или ошибки."""
-    configure_logging(log_level.upper())  # type: ignore[arg-type]
-    sites_dir_path = _resolve_sites_dir_cli(sites_dir)
+    from app.logger import configure_logging, get_console, get_logger
+    from app.workflow.runner import AgentRunner
+
+    configure_logging(args.log_level.upper())  # type: ignore[arg-type]
+    logger = get_logger(__name__)
+    console = get_console()
+    success_delay: float = args.success_delay
+    error_delay: float = args.error_delay
+    max_runs: Optional[int] = args.max_runs
+    sites_dir_path = _resolve_sites_dir_cli(args.sites_dir)
     runner = AgentRunner()
     options = _build_runner_options(
-        config_path=config_path,
+        config_path=args.config_path,
         sites_dir=sites_dir_path,
         run_id=None,
-        resume=resume,
-        reset_state=reset_state,
-        dry_run=dry_run,
+        resume=args.resume,
+        reset_state=args.reset_state,
+        dry_run=args.dry_run,
     )
     runs_completed = 0
     console.print(
@@ -168,32 +253,31 @@ def watch_agent(
         f"success_delay={success_delay}s, error_delay={error_delay}s, "
         f"max_runs={max_runs or '∞'}",
     )
+    # Пауза выполняется в начале следующей итерации: после последнего разрешённого запуска
+    # цикл завершается условием while без лишнего ожидания.
+    wait_time = 0.0
     try:
         while max_runs is None or runs_completed < max_runs:
-            wait_time = success_delay
+            if wait_time > 0:
+                console.print(_NEXT_RUN_MESSAGE.format(wait_time))
+                time.sleep(wait_time)
             try:
                 runner.run(options)
-                runs_completed += 1
-                logger.info("Цикл обхода #%s завершён", runs_completed)
             except Exception:  # pragma: no cover - зависит от окружения запуска
                 logger.exception(
                     "Запуск агента завершился ошибкой, повтор через %s секунд",
                     error_delay,
                 )
                 wait_time = error_delay
-            if max_runs is not None and runs_completed >= max_runs:
-                break
-            if wait_time <= 0:
-                continue
-            typer.echo(f"Следующий запуск через {wait_time:.0f} секунд")
-            try:
-                typer.sleep(wait_time)
-            except KeyboardInterrupt:
-                raise
+            else:
+                runs_completed += 1
+                logger.info("Цикл обхода #%s завершён", runs_completed)
+                wait_time = success_delay
     except KeyboardInterrupt:
         console.print("[yellow]Watch-режим остановлен пользователем[/yellow]")
 
 
-def entrypoint() -> None:
+def entrypoint(argv: Sequence[str] | None = None) -> None:
     """CLI entrypoint для Docker."""
-    cli()
+    args = parse_args(argv)
+    args.handler(args)
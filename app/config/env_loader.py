@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Mapping, overload
 
 from app.config.errors import ConfigLoaderError
 from app.config.models import (
@@ -23,77 +25,121 @@ from app.config.models import (
 from app.config.runtime_paths import resolve_optional_path, resolve_path
 
 
+# Префиксы/имена переменных окружения, от которых зависит GlobalConfig. Их снимок служит
+# ключом кеша: в watch-режиме конфигурация пересобирается только при изменении окружения.
+_ENV_KEY_PREFIXES = (
+    "SHEET_",
+    "RUNTIME_",
+    "NETWORK_",
+    "BEHAVIOR_",
+    "DEDUPE_",
+    "STATE_",
+    "PRODUCT_FETCH_ENGINE",
+    "FAIL_COOLDOWN_",
+    "APP_RUN_ENV",
+    "DOCKER_CONTAINER",
+)
+
+# Значения-списки в .env разделяются запятыми и/или переводами строк.
+_SPLIT_RE = re.compile(r"[,\n]+")
+_TRUE_VALUES = frozenset(("1", "true", "yes", "y", "on"))
+_FETCH_ENGINES = frozenset(("http", "browser"))
+
+
 def load_global_config_from_env() -> GlobalConfig:
-    """Строит глобальную конфигурацию на основе переменных окружения."""
+    """Строит глобальную конфигурацию на основе переменных окружения (с кешированием)."""
+    # Путь к storage_state зависит от наличия файла, а не только от env: файл может
+    # появиться между итерациями watch-режима, поэтому он резолвится вне кеша и входит в ключ.
+    storage_state_path = resolve_optional_path(
+        "NETWORK_BROWSER_STORAGE_STATE_PATH",
+        local_default="secrets/auth.json",
+        docker_default="/secrets/auth.json",
+        require_exists=True,
+    )
+    return _load_global_config_cached(_env_snapshot(), storage_state_path)
+
+
+def clear_global_config_cache() -> None:
+    """Сбрасывает кеш конфигурации из окружения."""
+    _load_global_config_cached.cache_clear()
+
+
+def _env_snapshot() -> frozenset[tuple[str, str]]:
+    return frozenset(
+        (name, value) for name, value in os.environ.items() if name.startswith(_ENV_KEY_PREFIXES)
+    )
+
+
+@lru_cache(maxsize=1)
+def _load_global_config_cached(
+    snapshot: frozenset[tuple[str, str]], storage_state_path: Path | None
+) -> GlobalConfig:
+    return _build_global_config(dict(snapshot), storage_state_path)
+
+
+def _build_global_config(env: Mapping[str, str], storage_state_path: Path | None) -> GlobalConfig:
     sheet = SheetConfig(
-        spreadsheet_id=_require("SHEET_SPREADSHEET_ID"),
-        write_batch_size=_int("SHEET_WRITE_BATCH_SIZE", default=200),
-        sheet_state_tab=os.getenv("SHEET_STATE_TAB", "_state"),
-        sheet_runs_tab=os.getenv("SHEET_RUNS_TAB", "_runs"),
+        spreadsheet_id=_require(env, "SHEET_SPREADSHEET_ID"),
+        write_batch_size=_int(env, "SHEET_WRITE_BATCH_SIZE", default=200),
+        sheet_state_tab=env.get("SHEET_STATE_TAB", "_state"),
+        sheet_runs_tab=env.get("SHEET_RUNS_TAB", "_runs"),
     )
 
     runtime = RuntimeConfig(
-        max_concurrency_per_site=_int("RUNTIME_MAX_CONCURRENCY_PER_SITE", default=1),
+        max_concurrency_per_site=_int(env, "RUNTIME_MAX_CONCURRENCY_PER_SITE", default=1),
         global_stop=GlobalStopConfig(
-            stop_after_products=_int("RUNTIME_STOP_AFTER_PRODUCTS"),
-            stop_after_minutes=_int("RUNTIME_STOP_AFTER_MINUTES"),
+            stop_after_products=_int(env, "RUNTIME_STOP_AFTER_PRODUCTS"),
+            stop_after_minutes=_int(env, "RUNTIME_STOP_AFTER_MINUTES"),
         ),
         page_delay=_delay_from_env(
+            env,
             prefix="RUNTIME_PAGE_DELAY",
             default_min=5.0,
             default_max=8.0,
         ),
         product_delay=_delay_from_env(
+            env,
             prefix="RUNTIME_PRODUCT_DELAY",
             default_min=8.0,
             default_max=12.0,
         ),
-        behavior=_behavior_from_env(),
-        product_fetch_engine=_product_fetch_engine(),
-        fail_cooldown_threshold=_ensure_cooldown_threshold(),
-        fail_cooldown_seconds=_ensure_cooldown_seconds(),
+        behavior=_behavior_from_env(env),
+        product_fetch_engine=_product_fetch_engine(env),
+        fail_cooldown_threshold=_int(env, "FAIL_COOLDOWN_THRESHOLD", default=5),
+        fail_cooldown_seconds=_int(env, "FAIL_COOLDOWN_SECONDS", default=0),
     )
 
-    headless_flag = _bool("NETWORK_BROWSER_HEADLESS", default=True)
-    if headless_flag is None:
-        headless_flag = True
-    revive_minutes = _float("NETWORK_PROXY_REVIVE_AFTER_MINUTES", default=30.0)
-    if revive_minutes is None:
-        revive_minutes = 30.0
+    revive_minutes = _float(env, "NETWORK_PROXY_REVIVE_AFTER_MINUTES", default=30.0)
     network = NetworkConfig(
-        user_agents=_list_required("NETWORK_USER_AGENTS"),
-        proxy_pool=_list("NETWORK_PROXY_POOL"),
-        proxy_allow_direct=_bool("NETWORK_PROXY_ALLOW_DIRECT", default=False) or False,
+        user_agents=_list_required(env, "NETWORK_USER_AGENTS"),
+        proxy_pool=_list(env, "NETWORK_PROXY_POOL"),
+        proxy_allow_direct=_bool(env, "NETWORK_PROXY_ALLOW_DIRECT", default=False),
         proxy_revive_after_sec=max(0.0, revive_minutes * 60.0),
-        request_timeout_sec=_float("NETWORK_REQUEST_TIMEOUT_SEC", default=30.0),
+        request_timeout_sec=_float(env, "NETWORK_REQUEST_TIMEOUT_SEC", default=30.0),
         retry=RetryPolicy(
-            max_attempts=_int("NETWORK_RETRY_MAX_ATTEMPTS", default=3),
+            max_attempts=_int(env, "NETWORK_RETRY_MAX_ATTEMPTS", default=3),
             backoff_sec=_float_list(
+                env,
                 "NETWORK_RETRY_BACKOFF_SEC",
                 default=[2.0, 5.0, 10.0],
             ),
         ),
-        browser_storage_state_path=resolve_optional_path(
-            "NETWORK_BROWSER_STORAGE_STATE_PATH",
-            local_default="secrets/auth.json",
-            docker_default="/secrets/auth.json",
-            require_exists=True,
-        ),
-        accept_language=os.getenv("NETWORK_ACCEPT_LANGUAGE"),
-        browser_headless=headless_flag,
-        browser_preview_delay_sec=_float("NETWORK_BROWSER_PREVIEW_DELAY_SEC", default=0.0)
-        or 0.0,
+        browser_storage_state_path=storage_state_path,
+        accept_language=env.get("NETWORK_ACCEPT_LANGUAGE"),
+        browser_headless=_bool(env, "NETWORK_BROWSER_HEADLESS", default=True),
+        browser_preview_delay_sec=_float(env, "NETWORK_BROWSER_PREVIEW_DELAY_SEC", default=0.0),
         browser_preview_before_behavior_sec=_float(
+            env,
             "NETWORK_BROWSER_PREVIEW_BEFORE_BEHAVIOR_SEC",
             default=0.0,
-        )
-        or 0.0,
+        ),
         browser_extra_page_preview_sec=_float(
+            env,
             "NETWORK_BROWSER_EXTRA_PAGE_PREVIEW_SEC",
             default=0.0,
-        )
-        or 0.0,
-        browser_slow_mo_ms=_int("NETWORK_BROWSER_SLOW_MO_MS", default=0) or 0,
+        ),
+        browser_slow_mo_ms=_int(env, "NETWORK_BROWSER_SLOW_MO_MS", default=0),
+        browser_block_resource_types=_list(env, "NETWORK_BROWSER_BLOCK_RESOURCE_TYPES"),
         bad_proxy_log_path=resolve_optional_path(
             "NETWORK_BAD_PROXY_LOG_PATH",
             local_default="logs/bad_proxies.log",
@@ -102,11 +148,11 @@ def load_global_config_from_env() -> GlobalConfig:
     )
 
     dedupe = DedupeConfig(
-        strip_params_blacklist=_list("DEDUPE_STRIP_PARAMS_BLACKLIST"),
+        strip_params_blacklist=_list(env, "DEDUPE_STRIP_PARAMS_BLACKLIST"),
     )
 
     state = StateConfig(
-        driver=os.getenv("STATE_DRIVER", "sqlite"),  # type: ignore[arg-type]
+        driver=env.get("STATE_DRIVER", "sqlite"),  # type: ignore[arg-type]
         database=resolve_path(
             "STATE_DATABASE_PATH",
             local_default="state/runtime.db",
@@ -123,131 +169,99 @@ def load_global_config_from_env() -> GlobalConfig:
     )
 
 
-def _behavior_from_env() -> HumanBehaviorConfig:
-    enabled = _bool("BEHAVIOR_ENABLED", default=False) or False
-    debug = _bool("BEHAVIOR_DEBUG", default=False) or False
-    action_delay = _delay_from_env(
-        prefix="BEHAVIOR_ACTION_DELAY",
-        default_min=0.3,
-        default_max=0.9,
-    )
-    scroll_probability = _float("BEHAVIOR_SCROLL_PROBABILITY")
-    if scroll_probability is None:
-        scroll_probability = 0.7
-    scroll_skip = _float("BEHAVIOR_SCROLL_SKIP_PROBABILITY")
-    if scroll_skip is None:
-        scroll_skip = 0.2
-    scroll_min_depth = _int("BEHAVIOR_SCROLL_MIN_DEPTH")
-    if scroll_min_depth is None:
-        scroll_min_depth = 25
-    scroll_max_depth = _int("BEHAVIOR_SCROLL_MAX_DEPTH")
-    if scroll_max_depth is None:
-        scroll_max_depth = 85
-    scroll_min_steps = _int("BEHAVIOR_SCROLL_MIN_STEPS")
-    if scroll_min_steps is None:
-        scroll_min_steps = 2
-    scroll_max_steps = _int("BEHAVIOR_SCROLL_MAX_STEPS")
-    if scroll_max_steps is None:
-        scroll_max_steps = 5
-    scroll = BehaviorScrollConfig(
-        probability=scroll_probability,
-        skip_probability=scroll_skip,
-        min_depth_percent=scroll_min_depth,
-        max_depth_percent=scroll_max_depth,
-        min_steps=scroll_min_steps,
-        max_steps=scroll_max_steps,
-        pause_between_steps=_delay_from_env(
-            prefix="BEHAVIOR_SCROLL_STEP_DELAY",
-            default_min=0.2,
-            default_max=0.8,
-        ),
-    )
-    move_min = _int("BEHAVIOR_MOUSE_MOVE_MIN")
-    if move_min is None:
-        move_min = 1
-    move_max = _int("BEHAVIOR_MOUSE_MOVE_MAX")
-    if move_max is None:
-        move_max = 3
-    hover_probability = _float("BEHAVIOR_MOUSE_HOVER_PROBABILITY")
-    if hover_probability is None:
-        hover_probability = 0.35
-    mouse = BehaviorMouseConfig(
-        move_count_min=move_min,
-        move_count_max=move_max,
-        hover_probability=hover_probability,
-    )
-    back_probability = _float("BEHAVIOR_NAV_BACK_PROBABILITY")
-    if back_probability is None:
-        back_probability = 0.25
-    extra_probability = _float("BEHAVIOR_NAV_EXTRA_PRODUCTS_PROBABILITY")
-    if extra_probability is None:
-        extra_probability = 0.3
-    extra_limit = _int("BEHAVIOR_NAV_EXTRA_PRODUCTS_LIMIT")
-    if extra_limit is None:
-        extra_limit = 2
-    visit_root_probability = _float("BEHAVIOR_NAV_VISIT_ROOT_PROBABILITY")
-    if visit_root_probability is None:
-        visit_root_probability = 0.15
-    max_chain = _int("BEHAVIOR_NAV_MAX_CHAIN")
-    if max_chain is None:
-        max_chain = 2
-    navigation = BehaviorNavigationConfig(
-        back_probability=back_probability,
-        extra_products_probability=extra_probability,
-        extra_products_limit=extra_limit,
-        visit_root_probability=visit_root_probability,
-        max_additional_chain=max_chain,
+# Скалярные параметры поведенческого слоя: (секция, поле модели, переменная, тип, default).
+# Задержки (action_delay, pause_between_steps) собираются отдельно через _delay_from_env.
+_BEHAVIOR_ENV_SCHEMA: tuple[tuple[str, str, str, str, Any], ...] = (
+    ("behavior", "enabled", "BEHAVIOR_ENABLED", "bool", False),
+    ("behavior", "debug", "BEHAVIOR_DEBUG", "bool", False),
+    ("scroll", "probability", "BEHAVIOR_SCROLL_PROBABILITY", "float", 0.7),
+    ("scroll", "skip_probability", "BEHAVIOR_SCROLL_SKIP_PROBABILITY", "float", 0.2),
+    ("scroll", "min_depth_percent", "BEHAVIOR_SCROLL_MIN_DEPTH", "int", 25),
+    ("scroll", "max_depth_percent", "BEHAVIOR_SCROLL_MAX_DEPTH", "int", 85),
+    ("scroll", "min_steps", "BEHAVIOR_SCROLL_MIN_STEPS", "int", 2),
+    ("scroll", "max_steps", "BEHAVIOR_SCROLL_MAX_STEPS", "int", 5),
+    ("mouse", "move_count_min", "BEHAVIOR_MOUSE_MOVE_MIN", "int", 1),
+    ("mouse", "move_count_max", "BEHAVIOR_MOUSE_MOVE_MAX", "int", 3),
+    ("mouse", "hover_probability", "BEHAVIOR_MOUSE_HOVER_PROBABILITY", "float", 0.35),
+    ("navigation", "back_probability", "BEHAVIOR_NAV_BACK_PROBABILITY", "float", 0.25),
+    (
+        "navigation",
+        "extra_products_probability",
+        "BEHAVIOR_NAV_EXTRA_PRODUCTS_PROBABILITY",
+        "float",
+        0.3,
+    ),
+    ("navigation", "extra_products_limit", "BEHAVIOR_NAV_EXTRA_PRODUCTS_LIMIT", "int", 2),
+    ("navigation", "visit_root_probability", "BEHAVIOR_NAV_VISIT_ROOT_PROBABILITY", "float", 0.15),
+    ("navigation", "max_additional_chain", "BEHAVIOR_NAV_MAX_CHAIN", "int", 2),
+)
+
+
+def _behavior_from_env(env: Mapping[str, str]) -> HumanBehaviorConfig:
+    sections: dict[str, dict[str, Any]] = {
+        "behavior": {},
+        "scroll": {},
+        "mouse": {},
+        "navigation": {},
+    }
+    for section, field_name, env_name, kind, default in _BEHAVIOR_ENV_SCHEMA:
+        sections[section][field_name] = _ENV_PARSERS[kind](env, env_name, default=default)
+    sections["scroll"]["pause_between_steps"] = _delay_from_env(
+        env,
+        prefix="BEHAVIOR_SCROLL_STEP_DELAY",
+        default_min=0.2,
+        default_max=0.8,
     )
     return HumanBehaviorConfig(
-        enabled=enabled,
-        debug=debug,
-        action_delay=action_delay,
-        scroll=scroll,
-        mouse=mouse,
-        navigation=navigation,
+        **sections["behavior"],
+        action_delay=_delay_from_env(
+            env,
+            prefix="BEHAVIOR_ACTION_DELAY",
+            default_min=0.3,
+            default_max=0.9,
+        ),
+        scroll=BehaviorScrollConfig(**sections["scroll"]),
+        mouse=BehaviorMouseConfig(**sections["mouse"]),
+        navigation=BehaviorNavigationConfig(**sections["navigation"]),
     )
 
 
-def _product_fetch_engine() -> str:
-    value = os.getenv("PRODUCT_FETCH_ENGINE", "http").strip().lower()
-    if value not in {"http", "browser"}:
+def _product_fetch_engine(env: Mapping[str, str]) -> str:
+    value = env.get("PRODUCT_FETCH_ENGINE")
+    if value is None:
+        return "http"
+    value = value.strip().lower()
+    if value not in _FETCH_ENGINES:
         raise ConfigLoaderError("PRODUCT_FETCH_ENGINE должен быть 'http' или 'browser'")
     return value
 
 
-def _ensure_cooldown_threshold() -> int:
-    value = _int("FAIL_COOLDOWN_THRESHOLD", default=5)
-    if value is None:
-        return 5
-    return value
+def _delay_from_env(
+    env: Mapping[str, str], *, prefix: str, default_min: float, default_max: float
+) -> DelayConfig:
+    return DelayConfig(
+        min_sec=_float(env, f"{prefix}_MIN_SEC", default=default_min),
+        max_sec=_float(env, f"{prefix}_MAX_SEC", default=default_max),
+    )
 
 
-def _ensure_cooldown_seconds() -> int:
-    value = _int("FAIL_COOLDOWN_SECONDS", default=0)
-    if value is None:
-        return 0
+def _require(env: Mapping[str, str], name: str) -> str:
+    value = env.get(name)
+    if not value:
+        raise ConfigLoaderError(f"Переменная окружения {name} не задана")
     return value
 
 
-def _delay_from_env(*, prefix: str, default_min: float, default_max: float) -> DelayConfig:
-    min_value = _float(f"{prefix}_MIN_SEC", default=default_min)
-    max_value = _float(f"{prefix}_MAX_SEC", default=default_max)
-    if min_value is None:
-        min_value = default_min
-    if max_value is None:
-        max_value = default_max
-    return DelayConfig(min_sec=min_value, max_sec=max_value)
+@overload
+def _int(env: Mapping[str, str], name: str, default: int) -> int: ...
 
 
-def _require(name: str) -> str:
-    value = os.getenv(name)
-    if not value:
-        raise ConfigLoaderError(f"Переменная окружения {name} не задана")
-    return value
+@overload
+def _int(env: Mapping[str, str], name: str, default: None = None) -> int | None: ...
 
 
-def _int(name: str, default: int | None = None) -> int | None:
-    value = os.getenv(name)
+def _int(env: Mapping[str, str], name: str, default: int | None = None) -> int | None:
+    value = env.get(name)
     if value is None or value == "":
         return default
     try:
@@ -256,8 +270,16 @@ def _int(name: str, default: int | None = None) -> int | None:
         raise ConfigLoaderError(f"Ожидается целое число в {name}") from exc
 
 
-def _float(name: str, default: float | None = None) -> float | None:
-    value = os.getenv(name)
+@overload
+def _float(env: Mapping[str, str], name: str, default: float) -> float: ...
+
+
+@overload
+def _float(env: Mapping[str, str], name: str, default: None = None) -> float | None: ...
+
+
+def _float(env: Mapping[str, str], name: str, default: float | None = None) -> float | None:
+    value = env.get(name)
     if value is None or value == "":
         return default
     try:
@@ -266,42 +288,49 @@ def _float(name: str, default: float | None = None) -> float | None:
         raise ConfigLoaderError(f"Ожидается число (float) в {name}") from exc
 
 
-def _list(name: str, default: Iterable[str] | None = None) -> list[str]:
-    value = os.getenv(name)
+def _list(env: Mapping[str, str], name: str, default: Iterable[str] | None = None) -> list[str]:
+    value = env.get(name)
     if value is None:
         return list(default) if default is not None else []
-    tokens = [
-        token.strip()
-        for token in value.replace("\n", ",").split(",")
-        if token.strip()
-    ]
-    return tokens
+    return _split_tokens(value)
 
 
-def _list_required(name: str) -> list[str]:
-    values = _list(name)
+def _list_required(env: Mapping[str, str], name: str) -> list[str]:
+    values = _list(env, name)
     if not values:
         raise ConfigLoaderError(f"Переменная {name} должна содержать минимум одно значение")
     return values
 
 
-def _float_list(name: str, default: Iterable[float] | None = None) -> list[float]:
-    value = os.getenv(name)
+def _float_list(
+    env: Mapping[str, str], name: str, default: Iterable[float] | None = None
+) -> list[float]:
+    value = env.get(name)
     if value is None:
         return list(default) if default is not None else []
-    tokens = [
-        token.strip()
-        for token in value.replace("\n", ",").split(",")
-        if token.strip()
-    ]
     try:
-        return [float(token) for token in tokens]
+        return [float(token) for token in _split_tokens(value)]
     except ValueError as exc:
         raise ConfigLoaderError(f"Элементы {name} должны быть числами") from exc
 
 
-def _bool(name: str, default: bool | None = None) -> bool | None:
-    value = os.getenv(name)
+def _split_tokens(value: str) -> list[str]:
+    return [token for token in (part.strip() for part in _SPLIT_RE.split(value)) if token]
+
+
+@overload
+def _bool(env: Mapping[str, str], name: str, default: bool) -> bool: ...
+
+
+@overload
+def _bool(env: Mapping[str, str], name: str, default: None = None) -> bool | None: ...
+
+
+def _bool(env: Mapping[str, str], name: str, default: bool | None = None) -> bool | None:
+    value = env.get(name)
     if value is None or value == "":
         return default
-    return value.strip().lower() in {"1", "true", "yes", "y", "on"}
+    return value.strip().lower() in _TRUE_VALUES
+
+
+_ENV_PARSERS: dict[str, Callable[..., Any]] = {"int": _int, "float": _float, "bool": _bool}
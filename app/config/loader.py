@@ -1,46 +1,97 @@
 from __future__ import annotations
-from itertools import chain
+
+import os
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable
 
 import yaml
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.config.env_loader import load_global_config_from_env
 from app.config.errors import ConfigLoaderError
 from app.config.models import GlobalConfig, SiteConfig
 from app.logger import get_logger
 
+try:  # libyaml-ускоритель доступен не во всех сборках PyYAML
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - зависит от сборки PyYAML
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 logger = get_logger(__name__)
 
+# Кеш валидированных конфигов сайтов: путь -> (mtime_ns, размер, конфиг). Watch-режим
+# не перечитывает файлы, пока они не изменились, а правка файла заменяет его запись.
+_SITE_CACHE: dict[str, tuple[int, int, SiteConfig]] = {}
+# Тот же принцип для файла общей конфигурации: валидация выполняется только при изменении файла.
+_GLOBAL_CACHE: dict[str, tuple[int, int, GlobalConfig]] = {}
+# Порядок расширений задаёт порядок обхода сайтов: сначала *.yml, затем *.yaml и *.json.
+_SITE_SUFFIXES: tuple[str, ...] = (".yml", ".yaml", ".json")
+# Валидаторы строятся один раз на модуль и переиспользуются для всех файлов.
+_GLOBAL_ADAPTER: TypeAdapter[GlobalConfig] = TypeAdapter(GlobalConfig)
+_SITE_ADAPTER: TypeAdapter[SiteConfig] = TypeAdapter(SiteConfig)
+
 
 def load_global_config(path: Path | None) -> GlobalConfig:
     """Загружает общую конфигурацию из файла или из окружения."""
-    if path:
-        return _load_global_config_from_file(path)
-    logger.info("Глобальная конфигурация читается из переменных окружения")
-    return load_global_config_from_env()
+    if not path:
+        # DEBUG: в watch-режиме функция вызывается на каждой итерации и не должна засорять INFO-лог.
+        logger.debug("Глобальная конфигурация читается из переменных окружения")
+        return load_global_config_from_env()
+    return _load_global_config_from_file(path)
 
 
 def _load_global_config_from_file(path: Path) -> GlobalConfig:
     try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-        return GlobalConfig.model_validate(data)
+        stat = path.stat()
+        cache_key = str(path)
+        cached = _GLOBAL_CACHE.get(cache_key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=_SafeLoader)
+        global_config = _GLOBAL_ADAPTER.validate_python(data)
     except FileNotFoundError as exc:
         raise ConfigLoaderError(f"Файл {path} не найден") from exc
     except ValidationError as exc:
         raise ConfigLoaderError(f"Некорректная общая конфигурация: {exc}") from exc
+    _GLOBAL_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, global_config)
+    return global_config
 
 
 def iter_site_configs(directory: Path) -> Iterable[SiteConfig]:
     """Возвращает генератор валидных конфигураций сайтов."""
-    patterns: Sequence[str] = ("*.yml", "*.yaml", "*.json")
-    files = chain.from_iterable(sorted(directory.glob(pattern)) for pattern in patterns)
-    for site_file in files:
-        raw = yaml.safe_load(site_file.read_text(encoding="utf-8"))
-        try:
-            yield SiteConfig.model_validate(raw)
-        except ValidationError as exc:
-            raise ConfigLoaderError(
-                f"Ошибка в конфигурации сайта {site_file.name}: {exc}"
-            ) from exc
+    # Файлы разбираются по одному по мере обхода: неизменённые берутся из кеша,
+    # а ошибка в одном файле не мешает отдать уже прочитанные конфиги.
+    for site_file in _list_site_files(directory):
+        yield _load_site_file(site_file)
+
+
+def _list_site_files(directory: Path) -> list[Path]:
+    # Один проход по каталогу вместо отдельного glob на каждое расширение.
+    try:
+        with os.scandir(directory) as entries:
+            matched = [
+                (_SITE_SUFFIXES.index(suffix), entry.name)
+                for entry in entries
+                if (suffix := os.path.splitext(entry.name)[1]) in _SITE_SUFFIXES
+                and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    return [directory / name for _, name in sorted(matched)]
+
+
+def _load_site_file(site_file: Path) -> SiteConfig:
+    stat = site_file.stat()
+    cache_key = str(site_file)
+    cached = _SITE_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    raw = yaml.load(site_file.read_text(encoding="utf-8"), Loader=_SafeLoader)
+    try:
+        site_config = _SITE_ADAPTER.validate_python(raw)
+    except ValidationError as exc:
+        raise ConfigLoaderError(
+            f"Ошибка в конфигурации сайта {site_file.name}: {exc}"
+        ) from exc
+    _SITE_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, site_config)
+    return site_config
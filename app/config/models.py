@@ -1,34 +1,73 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, ClassVar, Literal
 
 from pydantic import (
     BaseModel,
+    ConfigDict,
     Field,
     HttpUrl,
     PositiveInt,
     RootModel,
-    field_validator,
+    ValidationError,
+    WrapValidator,
     model_validator,
 )
+from pydantic_core import PydanticCustomError
+
+
+class _ConfigModel(BaseModel):
+    """Базовая модель конфигурации: объекты неизменяемы после загрузки."""
+
+    # Конфиг читается на каждой странице и кешируется загрузчиком, поэтому изменения
+    # делаются только через model_copy(update=...), а не присваиванием полей.
+    model_config = ConfigDict(frozen=True)
+
+
+def _constraint_message(error_type: str, message: str) -> WrapValidator:
+    """
+    Подменяет стандартный текст pydantic для ограничения Field на русское сообщение.
+
+    Ограничение по-прежнему проверяет pydantic-core; перехватывается только ошибка типа
+    `error_type`, остальные (например, неверный тип значения) пробрасываются как есть.
+    В `message` доступен плейсхолдер `{key}` — первый элемент пути ошибки (ключ словаря).
+    """
+
+    def _validate(value: Any, handler: Any) -> Any:
+        try:
+            return handler(value)
+        except ValidationError as exc:
+            failed = next((err for err in exc.errors() if err["type"] == error_type), None)
+            if failed is None:
+                raise
+            key = failed["loc"][0] if failed["loc"] else ""
+            raise PydanticCustomError("config_constraint", message, {"key": key}) from None
+
+    return WrapValidator(_validate)
 
 
 def _default_retry_backoff() -> list[float]:
     return [2.0, 5.0, 10.0]
 
 
-class RetryPolicy(BaseModel):
+class RetryPolicy(_ConfigModel):
     """Настройки повторов HTTP/Google API."""
 
     max_attempts: PositiveInt = Field(default=3, le=10)
     backoff_sec: list[float] = Field(default_factory=_default_retry_backoff)
 
 
-class NetworkConfig(BaseModel):
+class NetworkConfig(_ConfigModel):
     """Глобальные сетевые настройки."""
 
-    user_agents: list[str]
+    # Непустота списков проверяется ограничением min_length в pydantic-core;
+    # _constraint_message только возвращает русский текст ошибки.
+    user_agents: Annotated[
+        list[str],
+        Field(min_length=1),
+        _constraint_message("too_short", "Нужно указать минимум один User-Agent"),
+    ]
     proxy_pool: list[str] = Field(default_factory=list)
     proxy_allow_direct: bool = False
     proxy_revive_after_sec: float = Field(default=1800.0, ge=0.0)
@@ -41,18 +80,11 @@ class NetworkConfig(BaseModel):
     browser_preview_before_behavior_sec: float = Field(default=0.0, ge=0.0)
     browser_extra_page_preview_sec: float = Field(default=0.0, ge=0.0)
     browser_slow_mo_ms: int = Field(default=0, ge=0)
+    browser_block_resource_types: list[str] = Field(default_factory=list)
     bad_proxy_log_path: Path | None = None
 
-    @field_validator("user_agents")
-    @classmethod
-    def _ensure_user_agents(cls, value: list[str]) -> list[str]:
-        if not value:
-            msg = "Нужно указать минимум один User-Agent"
-            raise ValueError(msg)
-        return value
 
-
-class SheetConfig(BaseModel):
+class SheetConfig(_ConfigModel):
     """Настройки Google Sheets."""
 
     spreadsheet_id: str
@@ -61,23 +93,32 @@ class SheetConfig(BaseModel):
     sheet_runs_tab: str = Field(default="_runs")
 
 
-class GlobalStopConfig(BaseModel):
+class GlobalStopConfig(_ConfigModel):
     stop_after_products: int | None = None
     stop_after_minutes: int | None = None
 
 
-class DelayConfig(BaseModel):
-    min_sec: float = Field(default=0.0, ge=0)
-    max_sec: float = Field(default=0.0, ge=0)
+class _OrderedBoundsModel(_ConfigModel):
+    """Базовая модель с общей проверкой пар «минимум ≤ максимум»."""
+
+    _ordered_bounds: ClassVar[tuple[tuple[str, str], ...]] = ()
 
     @model_validator(mode="after")
-    def _ensure_bounds(self) -> "DelayConfig":
-        if self.max_sec < self.min_sec:
-            msg = "max_sec должен быть не меньше min_sec"
-            raise ValueError(msg)
+    def _ensure_bounds(self) -> "_OrderedBoundsModel":
+        for low, high in self._ordered_bounds:
+            if getattr(self, high) < getattr(self, low):
+                msg = f"{high} должен быть не меньше {low}"
+                raise ValueError(msg)
         return self
 
 
+class DelayConfig(_OrderedBoundsModel):
+    _ordered_bounds = (("min_sec", "max_sec"),)
+
+    min_sec: float = Field(default=0.0, ge=0)
+    max_sec: float = Field(default=0.0, ge=0)
+
+
 def _default_page_delay() -> DelayConfig:
     return DelayConfig(min_sec=5.0, max_sec=8.0)
 
@@ -90,7 +131,12 @@ def _default_behavior_action_delay() -> DelayConfig:
     return DelayConfig(min_sec=0.3, max_sec=0.9)
 
 
-class BehaviorScrollConfig(BaseModel):
+class BehaviorScrollConfig(_OrderedBoundsModel):
+    _ordered_bounds = (
+        ("min_depth_percent", "max_depth_percent"),
+        ("min_steps", "max_steps"),
+    )
+
     probability: float = Field(default=0.7, ge=0.0, le=1.0)
     skip_probability: float = Field(default=0.2, ge=0.0, le=1.0)
     min_depth_percent: int = Field(default=25, ge=1, le=100)
@@ -101,32 +147,17 @@ class BehaviorScrollConfig(BaseModel):
         default_factory=lambda: DelayConfig(min_sec=0.2, max_sec=0.8)
     )
 
-    @model_validator(mode="after")
-    def _ensure_bounds(self) -> "BehaviorScrollConfig":
-        if self.max_depth_percent < self.min_depth_percent:
-            msg = "max_depth_percent должен быть не меньше min_depth_percent"
-            raise ValueError(msg)
-        if self.max_steps < self.min_steps:
-            msg = "max_steps должен быть не меньше min_steps"
-            raise ValueError(msg)
-        return self
 
+class BehaviorMouseConfig(_OrderedBoundsModel):
+    _ordered_bounds = (("move_count_min", "move_count_max"),)
 
-class BehaviorMouseConfig(BaseModel):
     move_count_min: int = Field(default=1, ge=0)
     move_count_max: int = Field(default=3, ge=0)
     hover_probability: float = Field(default=0.35, ge=0.0, le=1.0)
     hover_selectors: list[str] = Field(default_factory=list)
 
-    @model_validator(mode="after")
-    def _ensure_bounds(self) -> "BehaviorMouseConfig":
-        if self.move_count_max < self.move_count_min:
-            msg = "move_count_max должен быть не меньше move_count_min"
-            raise ValueError(msg)
-        return self
-
 
-class BehaviorNavigationConfig(BaseModel):
+class BehaviorNavigationConfig(_ConfigModel):
     back_probability: float = Field(default=0.25, ge=0.0, le=1.0)
     extra_products_probability: float = Field(default=0.3, ge=0.0, le=1.0)
     extra_products_limit: int = Field(default=2, ge=0, le=5)
@@ -134,7 +165,7 @@ class BehaviorNavigationConfig(BaseModel):
     max_additional_chain: int = Field(default=2, ge=0)
 
 
-class HumanBehaviorConfig(BaseModel):
+class HumanBehaviorConfig(_ConfigModel):
     enabled: bool = False
     debug: bool = False
     action_delay: DelayConfig = Field(default_factory=_default_behavior_action_delay)
@@ -143,7 +174,7 @@ class HumanBehaviorConfig(BaseModel):
     navigation: BehaviorNavigationConfig = Field(default_factory=BehaviorNavigationConfig)
 
 
-class RuntimeConfig(BaseModel):
+class RuntimeConfig(_ConfigModel):
     """Общие лимиты выполнения."""
 
     max_concurrency_per_site: PositiveInt = Field(default=1, le=10)
@@ -156,13 +187,13 @@ class RuntimeConfig(BaseModel):
     fail_cooldown_seconds: int = Field(default=0, ge=0)
 
 
-class DedupeConfig(BaseModel):
+class DedupeConfig(_ConfigModel):
     """Правила нормализации ссылок."""
 
     strip_params_blacklist: list[str] = Field(default_factory=list)
 
 
-class StateConfig(BaseModel):
+class StateConfig(_ConfigModel):
     """Настройки хранения локального состояния."""
 
     driver: Literal["sqlite", "jsonl"] = Field(default="sqlite")
@@ -170,18 +201,18 @@ class StateConfig(BaseModel):
     snapshots_dir: Path | None = None
 
 
-class WaitCondition(BaseModel):
+class WaitCondition(_ConfigModel):
     type: Literal["selector", "delay"]
     value: str | float
     timeout_sec: float = Field(default=15, gt=0)
 
 
-class StopCondition(BaseModel):
+class StopCondition(_ConfigModel):
     type: Literal["missing_selector", "no_new_products", "custom"]
     value: str | None = None
 
 
-class PaginationConfig(BaseModel):
+class PaginationConfig(_ConfigModel):
     mode: Literal["numbered_pages", "next_button", "infinite_scroll"]
     param_name: str | None = None
     next_button_selector: str | None = None
@@ -205,9 +236,15 @@ class PaginationConfig(BaseModel):
 
 
 SelectorValue = str | list[str] | None
+# Непустой список URL категорий; общий алиас, чтобы схема описывалась в одном месте.
+SiteUrlList = Annotated[
+    list[HttpUrl],
+    Field(min_length=1),
+    _constraint_message("too_short", "Для сайта нужно указать минимум один category_url"),
+]
 
 
-class SelectorConfig(BaseModel):
+class SelectorConfig(_ConfigModel):
     product_link_selector: str
     base_url: HttpUrl | None = None
     allowed_domains: list[str] = Field(default_factory=list)
@@ -237,44 +274,30 @@ class SelectorConfig(BaseModel):
     )
 
 
-class SiteLimits(BaseModel):
+class SiteLimits(_ConfigModel):
     max_products: int | None = None
     max_pages: int | None = None
     max_scrolls: int | None = None
 
 
-class SiteConfig(BaseModel):
+class SiteConfig(_ConfigModel):
     site: dict[str, Any]
     selectors: SelectorConfig
     pagination: PaginationConfig
     limits: SiteLimits = Field(default_factory=SiteLimits)
     wait_conditions: list[WaitCondition] = Field(default_factory=list)
     stop_conditions: list[StopCondition] = Field(default_factory=list)
-    category_urls: list[HttpUrl]
-    category_pages: dict[str, int] = Field(
+    category_urls: SiteUrlList
+    category_pages: Annotated[
+        dict[str, Annotated[int, Field(ge=1)]],
+        _constraint_message("greater_than_equal", "category_pages для {key} должен быть >= 1"),
+    ] = Field(
         default_factory=dict,
         description=(
             "Перекрытие количества страниц по конкретным категориям (ключ = URL категории)"
         ),
     )
 
-    @field_validator("category_urls")
-    @classmethod
-    def _ensure_categories(cls, value: list[HttpUrl]) -> list[HttpUrl]:
-        if not value:
-            msg = "Для сайта нужно указать минимум один category_url"
-            raise ValueError(msg)
-        return value
-
-    @field_validator("category_pages")
-    @classmethod
-    def _validate_category_pages(cls, value: dict[str, int]) -> dict[str, int]:
-        for category_url, pages in value.items():
-            if pages < 1:
-                msg = f"category_pages для {category_url} должен быть >= 1"
-                raise ValueError(msg)
-        return value
-
     @property
     def name(self) -> str:
         return self.site["name"]
@@ -294,7 +317,7 @@ class SiteConfig(BaseModel):
         )
 
 
-class GlobalConfig(BaseModel):
+class GlobalConfig(_ConfigModel):
     sheet: SheetConfig
     runtime: RuntimeConfig
     network: NetworkConfig
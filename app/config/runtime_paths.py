@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 LOCAL_ENV = "local"
@@ -12,11 +13,18 @@ def get_run_env() -> str:
     if value in {LOCAL_ENV, DOCKER_ENV}:
         return value
     # Автоматически определяем docker по наличию служебного файла внутри контейнера.
-    if Path("/.dockerenv").exists() or os.getenv("DOCKER_CONTAINER"):
+    if os.getenv("DOCKER_CONTAINER") or _dockerenv_exists():
         return DOCKER_ENV
     return LOCAL_ENV
 
 
+@lru_cache(maxsize=1)
+def _dockerenv_exists() -> bool:
+    # Файл-маркер не меняется за время жизни процесса, поэтому stat выполняется один раз;
+    # переменные окружения читаются заново, чтобы тесты могли переключать APP_RUN_ENV.
+    return Path("/.dockerenv").exists()
+
+
 def resolve_path(
     env_name: str,
     *,
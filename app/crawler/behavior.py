@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import logging
 import random
 import time
 from dataclasses import dataclass, field
 from typing import Any
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 
 from app.config.models import HumanBehaviorConfig
-from app.crawler.utils import jitter_sleep
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Шаги плана: [доля высоты страницы, пауза после шага в мс].
+_SCROLL_PLAN_JS = """async (plan) => {
+    for (const [fraction, pauseMs] of plan) {
+        window.scrollTo(0, document.body.scrollHeight * fraction);
+        await new Promise((resolve) => setTimeout(resolve, pauseMs));
+    }
+}"""
+_GATE_BITS = 32
+_GATE_SCALE = 1 << _GATE_BITS
+_SCROLL_TOP_JS = "() => window.scrollTo(0, 0);"
+_SCROLL_INTO_VIEW_JS = (
+    "(element) => element.scrollIntoView({behavior: 'smooth', block: 'center', inline: 'center'});"
+)
+
 
 @dataclass(slots=True)
 class BehaviorContext:
@@ -26,6 +40,25 @@ class BehaviorContext:
     scroll_max_percent: int | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class _PageCapabilities:
+    """Какие методы Playwright доступны у страницы (проверяется один раз на apply)."""
+
+    evaluate: bool
+    mouse: bool
+    query: bool
+    history: bool
+
+    @classmethod
+    def of(cls, page: Any) -> "_PageCapabilities":
+        return cls(
+            evaluate=hasattr(page, "evaluate"),
+            mouse=hasattr(page, "mouse"),
+            query=hasattr(page, "query_selector_all"),
+            history=hasattr(page, "go_back"),
+        )
+
+
 @dataclass(slots=True)
 class BehaviorResult:
     actions: list[str] = field(default_factory=list)
@@ -41,8 +74,31 @@ class HumanBehaviorController:
         default_timeout_sec: float,
         *,
         extra_page_preview_sec: float = 0.0,
+        rng: random.Random | None = None,
     ):
         self.config = config or HumanBehaviorConfig()
+        # Собственный генератор на контроллер: решения не зависят от глобального состояния
+        # модуля random, а в тестах генератор можно передать с фиксированным seed.
+        self._rng = rng or random.Random()
+        # Параметры раскладываются в плоские атрибуты один раз: конфиг неизменен
+        # на время жизни контроллера, а apply вызывается на каждой странице.
+        scroll = self.config.scroll
+        self._scroll_gate = _gate(scroll.probability)
+        self._scroll_skip_gate = _gate(scroll.skip_probability)
+        self._scroll_depth = (scroll.min_depth_percent, scroll.max_depth_percent)
+        self._scroll_steps = (scroll.min_steps, scroll.max_steps)
+        self._scroll_pause = scroll.pause_between_steps
+        mouse = self.config.mouse
+        self._mouse_moves = (mouse.move_count_min, mouse.move_count_max)
+        self._hover_gate = _gate(mouse.hover_probability)
+        self._hover_selectors: tuple[str, ...] = tuple(filter(None, mouse.hover_selectors))
+        navigation = self.config.navigation
+        self._back_gate = _gate(navigation.back_probability)
+        self._extra_products_gate = _gate(navigation.extra_products_probability)
+        self._extra_products_limit = max(0, navigation.extra_products_limit)
+        self._visit_root_gate = _gate(navigation.visit_root_probability)
+        self._max_additional_chain = navigation.max_additional_chain
+        self._action_delay = self.config.action_delay
         self.enabled = bool(self.config.enabled)
         self.debug = bool(self.config.debug)
         self._timeout_sec = default_timeout_sec
@@ -55,90 +111,99 @@ class HumanBehaviorController:
         context: BehaviorContext | None,
         meta: dict[str, Any] | None = None,
     ) -> BehaviorResult:
-        result = BehaviorResult()
         if not self.enabled:
-            return result
+            return BehaviorResult()
+        # Результат сразу ссылается на список действий, который дополняют шаги ниже.
+        actions: list[str] = []
+        result = BehaviorResult(actions=actions)
         started = time.perf_counter()
         meta = meta or {}
-        actions: list[str] = []
-        limit_value = self.config.navigation.max_additional_chain
+        limit_value = self._max_additional_chain
         remaining_nav: int | None
         if limit_value <= 0:
             remaining_nav = 0
         else:
             remaining_nav = limit_value
         try:
-            actions.extend(self._maybe_scroll(page, context))
-            actions.extend(self._maybe_move_mouse(page))
-            actions.extend(self._maybe_hover(page, context))
-            nav_actions = self._maybe_back_and_forward(page, remaining_nav)
+            caps = _PageCapabilities.of(page)
+            actions.extend(self._maybe_scroll(page, caps, context))
+            actions.extend(self._maybe_move_mouse(page, caps))
+            actions.extend(self._maybe_hover(page, caps, context))
+            nav_actions = self._maybe_back_and_forward(page, caps, remaining_nav)
             actions.extend(nav_actions)
             remaining_nav = _decrease_remaining(remaining_nav, len(nav_actions))
             root_actions = self._maybe_visit_root(page, context, remaining_nav)
             actions.extend(root_actions)
             remaining_nav = _decrease_remaining(remaining_nav, len(root_actions))
-            extra_actions = self._maybe_open_extra_products(page, context, remaining_nav)
+            extra_actions = self._maybe_open_extra_products(page, caps, context, remaining_nav)
             actions.extend(extra_actions)
-            result.actions = actions
         finally:
             result.duration_sec = max(0.0, time.perf_counter() - started)
-            log_payload = {
-                "url": meta.get("url"),
-                "proxy": meta.get("proxy"),
-                "context": meta.get("context"),
-                "actions": actions,
-                "duration_sec": round(result.duration_sec, 3),
-            }
             if actions or self.debug:
-                logger.info("Поведенческий слой отработал", extra=log_payload)
+                level, message = logging.INFO, "Поведенческий слой отработал"
             else:
-                logger.debug("Поведенческий слой пропущен", extra=log_payload)
+                level, message = logging.DEBUG, "Поведенческий слой пропущен"
+            # Словарь для extra собираем только если запись действительно попадёт в лог.
+            if logger.isEnabledFor(level):
+                logger.log(
+                    level,
+                    message,
+                    extra={
+                        "url": meta.get("url"),
+                        "proxy": meta.get("proxy"),
+                        "context": meta.get("context"),
+                        "actions": actions,
+                        "duration_sec": round(result.duration_sec, 3),
+                    },
+                )
         return result
 
-    def _maybe_scroll(self, page: Any, context: BehaviorContext | None) -> list[str]:
-        if random.random() > self.config.scroll.probability:
+    def _maybe_scroll(
+        self, page: Any, caps: _PageCapabilities, context: BehaviorContext | None
+    ) -> list[str]:
+        if not self._chance(self._scroll_gate):
             return []
-        if random.random() < self.config.scroll.skip_probability:
+        if self._chance(self._scroll_skip_gate):
             return []
-        if not hasattr(page, "evaluate"):
+        if not caps.evaluate:
             return []
-        min_depth = self.config.scroll.min_depth_percent
-        max_depth = self.config.scroll.max_depth_percent
+        min_depth, max_depth = self._scroll_depth
         if context is not None:
             if context.scroll_max_percent is not None:
                 max_depth = max(0, min(context.scroll_max_percent, max_depth))
             if context.scroll_min_percent is not None:
                 min_depth = max(0, min(context.scroll_min_percent, max_depth))
-        actions: list[str] = []
-        steps = random.randint(self.config.scroll.min_steps, self.config.scroll.max_steps)
-        depth = random.randint(min_depth, max_depth)
-        current = 0
+        steps = self._rng.randint(*self._scroll_steps)
+        depth = self._rng.randint(min_depth, max_depth)
+        pause = self._scroll_pause
+        plan: list[tuple[float, float]] = []
+        current = 0.0
         for _ in range(steps):
             increment = depth / steps
-            current = max(0.0, min(depth, current + increment + random.uniform(-5, 5)))
+            current = max(0.0, min(depth, current + increment + self._rng.uniform(-5, 5)))
             fraction = max(0.0, min(1.0, current / 100))
+            plan.append((fraction, self._rng.uniform(pause.min_sec, pause.max_sec) * 1000))
+        actions: list[str] = []
+        # Все шаги и паузы между ними выполняются в браузере за один evaluate,
+        # вместо отдельного round-trip к Playwright на каждый шаг.
+        try:
+            page.evaluate(_SCROLL_PLAN_JS, plan)
+        except Exception as exc:  # pragma: no cover - зависит от браузера
+            logger.debug("Не удалось выполнить скролл steps=%s error=%s", steps, exc)
+        else:
+            actions.extend(f"scroll:{int(fraction * 100)}" for fraction, _ in plan)
+        if self._chance(_SCROLL_TOP_GATE):
             try:
-                page.evaluate(
-                    "(fraction) => window.scrollTo(0, document.body.scrollHeight * fraction);",
-                    fraction,
-                )
-            except Exception as exc:  # pragma: no cover - зависит от браузера
-                logger.debug("Не удалось выполнить скролл fraction=%s error=%s", fraction, exc)
-                break
-            actions.append(f"scroll:{int(fraction * 100)}")
-            self._wait(self.config.scroll.pause_between_steps)
-        if random.random() < 0.15:
-            try:
-                page.evaluate("() => window.scrollTo(0, 0);")
+                page.evaluate(_SCROLL_TOP_JS)
                 actions.append("scroll:0")
             except Exception:  # pragma: no cover - зависит от браузера
                 pass
         return actions
 
-    def _maybe_move_mouse(self, page: Any) -> list[str]:
-        if not hasattr(page, "mouse"):
+    def _maybe_move_mouse(self, page: Any, caps: _PageCapabilities) -> list[str]:
+        if not caps.mouse:
             return []
-        count = random.randint(self.config.mouse.move_count_min, self.config.mouse.move_count_max)
+        count = self._rng.randint(*self._mouse_moves)
         if count <= 0:
             return []
         viewport = getattr(page, "viewport_size", None) or {"width": 1920, "height": 1080}
@@ -146,57 +211,55 @@ class HumanBehaviorController:
         height = viewport.get("height", 1080)
         actions: list[str] = []
         for _ in range(count):
-            target_x = random.randint(int(width * 0.1), max(int(width * 0.9), 1))
-            target_y = random.randint(int(height * 0.1), max(int(height * 0.9), 1))
+            target_x = self._rng.randint(int(width * 0.1), max(int(width * 0.9), 1))
+            target_y = self._rng.randint(int(height * 0.1), max(int(height * 0.9), 1))
             try:
-                page.mouse.move(target_x, target_y, steps=random.randint(10, 25))
+                page.mouse.move(target_x, target_y, steps=self._rng.randint(10, 25))
                 actions.append(f"mouse_move:{target_x}x{target_y}")
             except Exception as exc:  # pragma: no cover
                 logger.debug("Не удалось переместить курсор", extra={"error": str(exc)})
                 break
-            self._wait(self.config.action_delay)
+            self._wait(page)
         return actions
 
-    def _maybe_hover(self, page: Any, context: BehaviorContext | None) -> list[str]:
-        selectors_source: list[str] | None
+    def _maybe_hover(
+        self, page: Any, caps: _PageCapabilities, context: BehaviorContext | None
+    ) -> list[str]:
+        selectors: tuple[str, ...]
         if context is not None and context.hover_selectors is not None:
-            selectors_source = context.hover_selectors
+            selectors = tuple(filter(None, context.hover_selectors))
         else:
-            selectors_source = self.config.mouse.hover_selectors
-        if not selectors_source:
+            selectors = self._hover_selectors
+        if not selectors:
             return []
-        if random.random() > self.config.mouse.hover_probability:
+        if not self._chance(self._hover_gate):
             return []
-        if not hasattr(page, "query_selector_all"):
+        if not caps.query or not caps.mouse:
             return []
         actions: list[str] = []
-        selectors = [selector for selector in selectors_source if selector]
-        random.shuffle(selectors)
-        for selector in selectors:
+        for selector in self._rng.sample(selectors, len(selectors)):
             try:
                 nodes = page.query_selector_all(selector)
             except Exception:  # pragma: no cover
                 nodes = []
             if not nodes:
                 continue
-            node = random.choice(nodes)
-            if not hasattr(page, "mouse"):
-                continue
+            node = self._rng.choice(nodes)
             try:
                 bbox = node.bounding_box()
             except Exception:  # pragma: no cover
                 bbox = None
             if not bbox:
                 continue
-            target_x = bbox.get("x", 0) + bbox.get("width", 0) / 2 + random.uniform(-5, 5)
-            target_y = bbox.get("y", 0) + bbox.get("height", 0) / 2 + random.uniform(-5, 5)
+            target_x = bbox.get("x", 0) + bbox.get("width", 0) / 2 + self._rng.uniform(-5, 5)
+            target_y = bbox.get("y", 0) + bbox.get("height", 0) / 2 + self._rng.uniform(-5, 5)
             target_x = max(0, target_x)
             target_y = max(0, target_y)
             try:
                 page.mouse.move(
                     target_x,
                     target_y,
-                    steps=random.randint(15, 30),
+                    steps=self._rng.randint(15, 30),
                 )
             except Exception as exc:  # pragma: no cover
                 logger.debug(
@@ -205,24 +268,29 @@ class HumanBehaviorController:
                 )
                 continue
             actions.append(f"hover:{selector}")
-            self._wait(self.config.action_delay)
+            self._wait(page)
             break
         return actions
 
     def _maybe_open_extra_products(
         self,
         page: Any,
+        caps: _PageCapabilities,
         context: BehaviorContext | None,
         remaining: int | None,
     ) -> list[str]:
-        config = self.config.navigation
-        if random.random() > config.extra_products_probability:
+        if not self._chance(self._extra_products_gate):
             return []
         if remaining is not None and remaining <= 0:
             return []
         if not context or not context.product_link_selector:
             return []
-        if not hasattr(page, "query_selector_all"):
+        if not caps.query:
+            return []
+        limit = self._extra_products_limit
+        if remaining is not None:
+            limit = min(limit, remaining)
+        if limit <= 0:
             return []
         try:
             nodes = page.query_selector_all(context.product_link_selector)
@@ -230,13 +298,11 @@ class HumanBehaviorController:
             nodes = []
         if not nodes:
             return []
-        random.shuffle(nodes)
-        limit = max(0, config.extra_products_limit)
-        if remaining is not None:
-            limit = min(limit, remaining)
         base_url = context.base_url or context.category_url or ""
+        base_root = _url_root(base_url)
         actions: list[str] = []
-        for node in nodes[:limit]:
+        # sample выбирает limit случайных карточек за O(limit), не перемешивая весь список.
+        for node in self._rng.sample(nodes, min(limit, len(nodes))):
             href = None
             try:
                 href = node.get_attribute("href")
@@ -244,14 +310,15 @@ class HumanBehaviorController:
                 continue
             if not href:
                 continue
-            absolute = urljoin(base_url, href)
+            absolute = _absolute_url(base_url, base_root, href)
             if not absolute:
                 continue
-            self._scroll_to_node(page, node)
+            if caps.evaluate:
+                self._scroll_to_node(page, node)
             opened = self._open_in_new_page(page, absolute)
             if opened:
                 actions.append(f"extra_product:{absolute}")
-            self._wait(self.config.action_delay)
+            self._wait(page)
         return actions
 
     def _maybe_visit_root(
@@ -260,8 +327,7 @@ class HumanBehaviorController:
         context: BehaviorContext | None,
         remaining: int | None,
     ) -> list[str]:
-        config = self.config.navigation
-        if random.random() > config.visit_root_probability:
+        if not self._chance(self._visit_root_gate):
             return []
         if not context or not context.root_url:
             return []
@@ -272,10 +338,12 @@ class HumanBehaviorController:
             return []
         return [f"visit_root:{context.root_url}"]
 
-    def _maybe_back_and_forward(self, page: Any, remaining: int | None) -> list[str]:
-        if random.random() > self.config.navigation.back_probability:
+    def _maybe_back_and_forward(
+        self, page: Any, caps: _PageCapabilities, remaining: int | None
+    ) -> list[str]:
+        if not self._chance(self._back_gate):
             return []
-        if not hasattr(page, "go_back"):
+        if not caps.history:
             return []
         if remaining is not None and remaining < 2:
             return []
@@ -283,7 +351,7 @@ class HumanBehaviorController:
         try:
             page.go_back(wait_until="domcontentloaded", timeout=self._timeout_sec * 1000)
             actions.append("back")
-            self._wait(self.config.action_delay)
+            self._wait(page)
             page.go_forward(wait_until="domcontentloaded", timeout=self._timeout_sec * 1000)
             actions.append("forward")
         except Exception as exc:  # pragma: no cover
@@ -315,22 +383,42 @@ class HumanBehaviorController:
         return success
 
     def _scroll_to_node(self, page: Any, node: Any) -> None:
-        if not hasattr(page, "evaluate") or node is None:
+        if node is None:
             return
         try:
-            page.evaluate(
-                "(element) => element.scrollIntoView({behavior: 'smooth', block: 'center', inline: 'center'});",
-                node,
-            )
-            self._wait(self.config.action_delay)
+            page.evaluate(_SCROLL_INTO_VIEW_JS, node)
+            self._wait(page)
         except Exception as exc:  # pragma: no cover
             logger.debug("Не удалось плавно проскроллить к элементу", extra={"error": str(exc)})
 
-    def _wait(self, delay: Any) -> None:
-        if hasattr(delay, "min_sec") and hasattr(delay, "max_sec"):
-            jitter_sleep(delay.min_sec, delay.max_sec)
+    def _chance(self, gate: int) -> bool:
+        # Крайние значения решаются без обращения к генератору; в остальных случаях
+        # сравниваем 32 случайных бита с заранее посчитанным порогом.
+        if gate >= _GATE_SCALE:
+            return True
+        if gate <= 0:
+            return False
+        return self._rng.getrandbits(_GATE_BITS) < gate
+
+    def _wait(self, page: Any) -> None:
+        delay_sec = self._rng.uniform(self._action_delay.min_sec, self._action_delay.max_sec)
+        if delay_sec <= 0:
+            return
+        # Пауза через Playwright не блокирует обработку событий драйвера, в отличие
+        # от time.sleep в sync API; time.sleep остаётся запасным вариантом.
+        wait_for_timeout = getattr(page, "wait_for_timeout", None)
+        if wait_for_timeout is None:
+            time.sleep(delay_sec)
         else:
-            jitter_sleep(self.config.action_delay.min_sec, self.config.action_delay.max_sec)
+            wait_for_timeout(delay_sec * 1000)
+
+
+def _gate(probability: float) -> int:
+    """Переводит вероятность в целочисленный порог для сравнения с getrandbits."""
+    return max(0, min(_GATE_SCALE, int(probability * _GATE_SCALE)))
+
+
+_SCROLL_TOP_GATE = _gate(0.15)
 
 
 def _decrease_remaining(current: int | None, used: int) -> int | None:
@@ -338,3 +426,20 @@ def _decrease_remaining(current: int | None, used: int) -> int | None:
         return None
     remaining = max(0, current - used)
     return remaining
+
+
+def _url_root(base_url: str) -> str | None:
+    parts = urlsplit(base_url)
+    if not parts.scheme or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _absolute_url(base_url: str, base_root: str | None, href: str) -> str:
+    # Частые случаи (абсолютная ссылка и путь от корня) собираются без повторного
+    # разбора base_url; остальные формы делегируются urljoin.
+    if href.startswith(("http://", "https://")):
+        return href
+    if base_root and href.startswith("/") and not href.startswith("//") and "/." not in href:
+        return base_root + href
+    return urljoin(base_url, href)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal, Sequence
@@ -7,12 +8,11 @@ from urllib.parse import urljoin
 
 import httpx
 from bs4 import BeautifulSoup
-import re
 
 from app.config.models import HumanBehaviorConfig, NetworkConfig, PaginationConfig
 from app.crawler.behavior import BehaviorContext
 from app.crawler.engines import BrowserEngine, EngineRequest, ProxyPool, ProxyExhaustedError
-from app.crawler.utils import pick_user_agent
+from app.crawler.utils import build_request_headers, pick_user_agent
 from app.media.image_saver import ImageSaver
 from app.logger import get_logger
 from app.network.http_client_factory import HttpClientFactory
@@ -75,6 +75,8 @@ class ProductContentFetcher:
                 }
             )
         self.image_saver = ImageSaver(network, image_dir, proxy_pool=self._proxy_pool)
+        # Заголовки зависят только от UA: собираем их один раз, случайный выбор UA сохраняется.
+        self._headers_by_ua = {ua: build_request_headers(network, ua) for ua in network.user_agents}
         self._fail_cooldown_threshold = max(0, fail_cooldown_threshold)
         self._fail_cooldown_seconds = max(0, fail_cooldown_seconds)
         self._product_fail_streak = 0
@@ -94,12 +96,14 @@ class ProductContentFetcher:
         behavior_context: BehaviorContext | None = None,
     ) -> ProductContent:
         proxy_used: str | None = None
+        encoding: str | None = None
+        html: str | bytes | None
         try:
             if self._browser:
                 html = self._fetch_html_browser(product_url, behavior_context)
                 proxy_used = getattr(self._browser, "last_proxy", None)
             else:
-                html, proxy_used = self._fetch_html_http(product_url)
+                html, encoding, proxy_used = self._fetch_html_http(product_url)
         except Exception:
             self._register_product_failure()
             raise
@@ -107,24 +111,20 @@ class ProductContentFetcher:
             self._register_product_failure()
             return ProductContent()
         self._register_product_success()
-        soup = BeautifulSoup(html, "lxml")
-        text_content = _extract_text_content(
-            soup,
-            drop_after_selectors,
-            exclude_selectors,
+        content = parse_product_html(
+            html,
+            product_url,
+            encoding=encoding,
+            image_selector=image_selector,
+            drop_after_selectors=drop_after_selectors,
+            exclude_selectors=exclude_selectors,
+            name_en_selector=name_en_selector,
+            name_ru_selector=name_ru_selector,
+            price_without_discount_selector=price_without_discount_selector,
+            price_with_discount_selector=price_with_discount_selector,
         )
-        image_url = None
-        if image_selector:
-            node = soup.select_one(image_selector)
-            if node:
-                image_url = _extract_image_from_node(node, product_url)
-        if not image_url:
-            image_url = _extract_main_image_url(soup, product_url)
-        title = _extract_title(soup)
-        name_en = _extract_text_by_selector(soup, name_en_selector)
-        name_ru = _extract_text_by_selector(soup, name_ru_selector)
-        price_wo = _clean_price_text(_extract_text_by_selector(soup, price_without_discount_selector))
-        price_w = _clean_price_text(_extract_text_by_selector(soup, price_with_discount_selector))
+        image_url = content.image_url
+        title = content.title
 
         image_path = None
         if download_image and image_url:
@@ -147,26 +147,17 @@ class ProductContentFetcher:
             else:
                 image_path = self.image_saver.save(image_url, title or "product", product_url, proxy=proxy_used)
 
-        return ProductContent(
-            text_content=text_content,
-            image_url=image_url,
-            image_path=image_path,
-            title=title,
-            name_en=name_en,
-            name_ru=name_ru,
-            price_without_discount=price_wo,
-            price_with_discount=price_w,
-        )
+        content.image_path = image_path
+        return content
 
-    def _fetch_html_http(self, product_url: str) -> tuple[str | None, str | None]:
+    def _fetch_html_http(self, product_url: str) -> tuple[bytes | None, str | None, str | None]:
+        """Возвращает сырое тело ответа, его кодировку и использованный прокси."""
         if not self._http_client_factory:
-            return None, None
+            return None, None, None
         proxy: str | None = None
         try:
             ua = pick_user_agent(self.network)
-            headers = {"User-Agent": ua}
-            if self.network.accept_language:
-                headers["Accept-Language"] = self.network.accept_language
+            headers = self._headers_by_ua[ua]
             try:
                 proxy = self._proxy_pool.pick()
             except ProxyExhaustedError:
@@ -181,24 +172,32 @@ class ProductContentFetcher:
                     "Прокси-пул исчерпан для HTTP-загрузки",
                     extra={"url": product_url, "error_event": event},
                 )
-                return None, None
+                return None, None, None
             client = self._http_client_factory.get(proxy)
             response = client.get(
                 product_url,
                 headers=headers,
             )
-            response.raise_for_status()
-            logger.debug("HTTP fetch product url=%s proxy=%s ua=%s", product_url, proxy, ua)
-            self._proxy_pool.reset_issue_counter(proxy)
         except httpx.HTTPError as exc:
-            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 403 and self._proxy_pool:
-                self._proxy_pool.mark_forbidden(proxy)
             logger.warning(
                 "Не удалось загрузить страницу товара",
                 extra={"url": product_url, "error": str(exc)},
             )
-            return None, proxy
-        return response.text, proxy
+            return None, None, proxy
+        # Ошибочный статус — ожидаемый исход при смене прокси: проверяем код напрямую,
+        # не поднимая HTTPStatusError ради одного ветвления.
+        if not response.is_success:
+            if response.status_code == 403:
+                self._proxy_pool.mark_forbidden(proxy)
+            logger.warning(
+                "Не удалось загрузить страницу товара",
+                extra={"url": product_url, "error": f"HTTP {response.status_code}"},
+            )
+            return None, None, proxy
+        logger.debug("HTTP fetch product url=%s proxy=%s ua=%s", product_url, proxy, ua)
+        self._proxy_pool.reset_issue_counter(proxy)
+        # Отдаём байты: lxml декодирует их сам, без промежуточной строки response.text.
+        return response.content, response.encoding, proxy
 
     def _fetch_html_browser(
         self, product_url: str, behavior_context: BehaviorContext | None
@@ -249,6 +248,52 @@ class ProductContentFetcher:
         self._product_fail_streak = 0
 
 
+def parse_product_html(
+    html: str | bytes,
+    product_url: str,
+    *,
+    encoding: str | None = None,
+    image_selector: str | None = None,
+    drop_after_selectors: Sequence[str] | None = None,
+    exclude_selectors: Sequence[str] | None = None,
+    name_en_selector: str | None = None,
+    name_ru_selector: str | None = None,
+    price_without_discount_selector: str | None = None,
+    price_with_discount_selector: str | Sequence[str] | None = None,
+) -> ProductContent:
+    """
+    Извлекает данные карточки из HTML без сетевых операций (image_path не заполняется).
+
+    Для байтов `encoding` задаёт кодировку ответа; без неё BeautifulSoup определяет её сам.
+    """
+    soup = BeautifulSoup(html, "lxml", from_encoding=encoding if isinstance(html, bytes) else None)
+    text_content = _extract_text_content(
+        soup,
+        drop_after_selectors,
+        exclude_selectors,
+    )
+    image_url = None
+    if image_selector:
+        node = soup.select_one(image_selector)
+        if node:
+            image_url = _extract_image_from_node(node, product_url)
+    if not image_url:
+        image_url = _extract_main_image_url(soup, product_url)
+    return ProductContent(
+        text_content=text_content,
+        image_url=image_url,
+        title=_extract_title(soup),
+        name_en=_extract_text_by_selector(soup, name_en_selector),
+        name_ru=_extract_text_by_selector(soup, name_ru_selector),
+        price_without_discount=_clean_price_text(
+            _extract_text_by_selector(soup, price_without_discount_selector)
+        ),
+        price_with_discount=_clean_price_text(
+            _extract_text_by_selector(soup, price_with_discount_selector)
+        ),
+    )
+
+
 def _extract_text_content(
     soup: BeautifulSoup,
     drop_after_selectors: Sequence[str] | None = None,
@@ -271,9 +316,14 @@ def _strip_after_selectors(soup: BeautifulSoup, selectors: Sequence[str]) -> Non
         node = soup.select_one(selector)
         if not node:
             continue
-        to_remove = [node] + list(node.find_all_next())
-        for target in to_remove:
-            target.decompose()
+        # Всё, что идёт после узла, — это следующие теги-соседи самого узла и его предков:
+        # удаляем их целиком вместе с потомками, не перечисляя каждый вложенный тег.
+        current = node
+        while current is not None and current is not soup:
+            for sibling in current.find_next_siblings():
+                sibling.decompose()
+            current = current.parent
+        node.decompose()
 
 
 def _remove_selectors(soup: BeautifulSoup, selectors: Sequence[str]) -> None:
@@ -304,6 +354,8 @@ def _extract_text_by_selector(
 
 
 _PRICE_PATTERN = re.compile(r"(\d[\d\s.,]*)(?:\s*(₽|руб(?:\.|ль|ля|лей)?))?", re.IGNORECASE)
+# Любая последовательность символов кроме цифр и разделителей схлопывается в один пробел.
+_AMOUNT_NOISE_PATTERN = re.compile(r"[^\d.,]+")
 
 
 def _clean_price_text(value: str | None) -> str | None:
@@ -317,8 +369,7 @@ def _clean_price_text(value: str | None) -> str | None:
         return None
     amount = match.group(1) or ""
     currency = match.group(2) or ("₽" if "₽" in normalized else "")
-    amount = re.sub(r"[^\d.,]", " ", amount)
-    amount = re.sub(r"\s+", " ", amount).strip()
+    amount = _AMOUNT_NOISE_PATTERN.sub(" ", amount).strip()
     if not amount:
         return None
     if currency:
@@ -330,11 +381,22 @@ def _clean_price_text(value: str | None) -> str | None:
     return f"{amount} {currency}".strip()
 
 
+def _find_head_first(soup: BeautifulSoup, name: str, **kwargs: Any) -> Any:
+    # og-метатеги и <title> обычно живут в <head>: сначала ищем там, чтобы не проходить
+    # всё тело страницы. Часть сайтов ставит их в <body>, поэтому при промахе ищем везде.
+    head = soup.head
+    if head is not None:
+        found = head.find(name, **kwargs)
+        if found is not None:
+            return found
+    return soup.find(name, **kwargs)
+
+
 def _extract_title(soup: BeautifulSoup) -> str | None:
-    meta = soup.find("meta", attrs={"property": "og:title"})
+    meta = _find_head_first(soup, "meta", attrs={"property": "og:title"})
     if meta and meta.get("content"):
         return meta["content"].strip()
-    title_tag = soup.find("title")
+    title_tag = _find_head_first(soup, "title")
     if title_tag and title_tag.text:
         return title_tag.text.strip()
     h1 = soup.find("h1")
@@ -363,7 +425,7 @@ def _extract_image_from_node(node: Any, base_url: str) -> str | None:
 
 def _extract_main_image_url(soup: BeautifulSoup, base_url: str) -> str | None:
     # 1) og:image
-    meta_og = soup.find("meta", attrs={"property": "og:image"})
+    meta_og = _find_head_first(soup, "meta", attrs={"property": "og:image"})
     if meta_og and meta_og.get("content"):
         return urljoin(base_url, meta_og["content"])
 
@@ -383,33 +445,24 @@ def _extract_main_image_url(soup: BeautifulSoup, base_url: str) -> str | None:
 
 
 def _pick_best_srcset(srcset: str, base_url: str) -> str | None:
-    candidates = [
-        part.strip().split(" ")
-        for part in srcset.split(",")
-        if part.strip()
-    ]
-    best_url = None
-    best_priority = -1
-    best_score = -1.0
-    for candidate in candidates:
-        url_part = candidate[0]
-        descriptor = candidate[1] if len(candidate) > 1 else ""
-        priority = 0
-        score = 0.0
-        if descriptor.endswith("w"):
-            priority = 2
-            try:
-                score = float(descriptor[:-1])
-            except ValueError:
-                score = 0.0
-        elif descriptor.endswith("x"):
-            priority = 1
-            try:
-                score = float(descriptor[:-1])
-            except ValueError:
-                score = 0.0
-        if priority > best_priority or (priority == best_priority and score > best_score):
-            best_priority = priority
-            best_score = score
-            best_url = urljoin(base_url, url_part)
-    return best_url
+    candidates = [part.split() for part in srcset.split(",")]
+    candidates = [candidate for candidate in candidates if candidate]
+    if not candidates:
+        return None
+    # max() отдаёт первый из равных кандидатов, urljoin вызывается только для победителя.
+    best = max(candidates, key=_srcset_rank)
+    return urljoin(base_url, best[0])
+
+
+_SRCSET_PRIORITY = {"w": 2, "x": 1}
+
+
+def _srcset_rank(candidate: list[str]) -> tuple[int, float]:
+    descriptor = candidate[1] if len(candidate) > 1 else ""
+    priority = _SRCSET_PRIORITY.get(descriptor[-1:], 0)
+    if not priority:
+        return 0, 0.0
+    try:
+        return priority, float(descriptor[:-1])
+    except ValueError:
+        return priority, 0.0
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
+import heapq
 import random
 import time
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Iterable, Protocol
+from typing import Any, Callable, Iterable, Protocol, Sequence
 
 import httpx
 from urllib.parse import urlsplit
 
 from app.config.models import HumanBehaviorConfig, NetworkConfig, PaginationConfig, WaitCondition
 from app.crawler.behavior import BehaviorContext, HumanBehaviorController
+from app.crawler.utils import build_request_headers, pick_user_agent
 from app.logger import get_logger
 from app.monitoring import build_error_event
 from app.network.http_client_factory import HttpClientFactory
@@ -36,6 +37,19 @@ class CrawlerEngine(Protocol):
     def shutdown(self) -> None: ...
 
 
+_RECENT_ISSUES_LIMIT = 4096
+
+_SCROLL_TO_BOTTOM_JS = """() => {
+    const height = document.body.scrollHeight;
+    window.scrollTo(0, height);
+    return height;
+}"""
+_PAGE_GREW_JS = "(height) => document.body.scrollHeight > height"
+_SCROLL_GROWTH_TIMEOUT_MS = 3000
+# Паузы перед расширенными попытками BrowserEngine после исчерпания быстрых повторов.
+_EXTENDED_RETRY_WAITS_SEC = (120, 240, 900)
+
+
 class ProxyPool:
     def __init__(
         self,
@@ -54,14 +68,30 @@ class ProxyPool:
         self._allow_direct = allow_direct
         self._bad_log_path = bad_log_path
         self._forbidden_threshold = max(1, forbidden_threshold)
-        self._forbidden_counts: dict[str, int] = {}
-        self._issue_counts: dict[str, int] = {}
-        self._consecutive_errors: dict[tuple[str, str], int] = {}
-        self._recent_issue_ts: deque[float] = deque()
+        # Счётчики ведутся по самому значению прокси; прямое подключение хранится под ключом None.
+        self._forbidden_counts: dict[str | None, int] = {}
+        self._issue_counts: dict[str | None, int] = {}
+        # Серии ошибок сгруппированы по источнику: сброс при успехе — один pop, без обхода всех ключей.
+        self._consecutive_errors: dict[str | None, dict[str, int]] = {}
+        # Окно инцидентов подрезается только при чтении счётчика; maxlen ограничивает память
+        # при всплеске ошибок (счётчик в снапшоте тогда насыщается на этом значении).
+        self._recent_issue_ts: deque[float] = deque(maxlen=_RECENT_ISSUES_LIMIT)
         self._issue_window_sec = 300
         self._revive_after_sec = max(0.0, revive_after_sec)
-        self._time_provider = time_provider or time.time
+        # Часы привязываются атрибутом, без промежуточного метода: _now вызывается при каждом pick.
+        self._now: Callable[[], float] = time_provider or time.time
         self._blocked_until: dict[str, float | None] = {}
+        # Мин-куча сроков разблокировки: прунинг смотрит только на истёкшие записи.
+        # Записи, снятые раньше срока или перезаписанные новым блоком, отбрасываются при извлечении.
+        self._block_heap: list[tuple[float, str]] = []
+        # Порядок ротации перемешивается один раз и дальше не меняется: курсор обходит его по кругу,
+        # пропуская заблокированные и исключённые источники, поэтому за цикл каждый выпадает один раз.
+        order: list[str | None] = list(self._proxies)
+        random.shuffle(order)
+        if allow_direct:
+            order.append(None)
+        self._rotation_order: tuple[str | None, ...] = tuple(order)
+        self._cursor = 0
         self._direct_blocked = False
         self._direct_blocked_until: float | None = None
 
@@ -70,29 +100,40 @@ class ProxyPool:
             return self.override
         if not self._has_pool and not self._allow_direct:
             return None
-        excluded = set(exclude or [])
-        candidates = self._collect_candidates(excluded)
-        if not candidates and excluded:
-            candidates = self._collect_candidates(set())
-        if not candidates:
+        self._prune_expired_blocks()
+        excluded = set(exclude or ())
+        index = self._next_available_index(excluded)
+        if index is None and excluded:
+            # Исключены все доступные источники: повторно используем уже опробованные.
+            index = self._next_available_index(set())
+        if index is None:
             raise ProxyExhaustedError("Все прокси из пула помечены как недоступные")
-        return random.choice(candidates)
+        self._cursor = index + 1
+        return self._rotation_order[index]
 
-    def _collect_candidates(self, excluded: set[str | None]) -> list[str | None]:
-        self._prune_expired_blocks()
-        candidates = [
-            proxy
-            for proxy in self._proxies
-            if proxy not in excluded and not self._is_proxy_blocked(proxy)
-        ]
-        if self._allow_direct and not self._is_direct_blocked() and (None not in excluded):
-            candidates.append(None)
-        return candidates
+    def _next_available_index(self, excluded: set[str | None]) -> int | None:
+        """Индекс первого доступного источника в порядке ротации начиная с курсора."""
+        order = self._rotation_order
+        size = len(order)
+        direct_available = self._allow_direct and not self._is_direct_blocked()
+        for step in range(size):
+            index = (self._cursor + step) % size
+            source = order[index]
+            if source in excluded:
+                continue
+            if source is None:
+                if direct_available:
+                    return index
+            elif source not in self._blocked_until:
+                return index
+        return None
 
     def mark_bad(self, proxy: str | None, *, reason: str | None = None, log: bool = False) -> None:
-        key = self._make_key(proxy)
         if proxy and not self.override and self._has_pool:
-            self._blocked_until[proxy] = self._compute_block_expiration()
+            expires_at = self._compute_block_expiration()
+            self._blocked_until[proxy] = expires_at
+            if expires_at is not None:
+                heapq.heappush(self._block_heap, (expires_at, proxy))
         elif proxy is None and self._allow_direct:
             self._direct_blocked = True
             self._direct_blocked_until = self._compute_block_expiration()
@@ -101,26 +142,22 @@ class ProxyPool:
         self._note_issue_timestamp()
         self._clear_consecutive_for_proxy(proxy)
         if log:
-            self._write_bad_entry(key, reason)
+            self._write_bad_entry(proxy, reason)
 
     def mark_forbidden(self, proxy: str | None) -> None:
-        key = self._make_key(proxy)
-        current = self._forbidden_counts.get(key, 0) + 1
-        self._forbidden_counts[key] = current
+        current = self._forbidden_counts.get(proxy, 0) + 1
+        self._forbidden_counts[proxy] = current
         if current >= self._forbidden_threshold:
             self.mark_bad(proxy, reason="HTTP 403", log=True)
 
-    def _make_key(self, proxy: str | None) -> str:
-        return proxy or "__direct__"
-
-    def _write_bad_entry(self, key: str, reason: str | None) -> None:
+    def _write_bad_entry(self, proxy: str | None, reason: str | None) -> None:
         if not self._bad_log_path:
             return
         try:
             self._bad_log_path.parent.mkdir(parents=True, exist_ok=True)
-            timestamp = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
             with self._bad_log_path.open("a", encoding="utf-8") as handle:
-                handle.write(f"{timestamp}\t{key}\t{reason or ''}\n")
+                handle.write(f"{timestamp}\t{proxy or '__direct__'}\t{reason or ''}\n")
         except Exception:  # pragma: no cover - запись логов не должна ронять процесс
             logger.warning("Не удалось записать файл испорченных прокси", extra={"path": str(self._bad_log_path)})
 
@@ -129,27 +166,24 @@ class ProxyPool:
         return self._forbidden_threshold
 
     def register_issue(self, proxy: str | None, *, reason: str) -> bool:
-        key = self._make_key(proxy)
-        current = self._issue_counts.get(key, 0) + 1
-        self._issue_counts[key] = current
+        current = self._issue_counts.get(proxy, 0) + 1
+        self._issue_counts[proxy] = current
         self._note_issue_timestamp()
         if current >= self._forbidden_threshold:
             self.mark_bad(proxy, reason=reason, log=True)
-            self._issue_counts[key] = 0
+            self._issue_counts[proxy] = 0
             return True
         return False
 
     def reset_issue_counter(self, proxy: str | None) -> None:
-        key = self._make_key(proxy)
-        if key in self._issue_counts:
-            del self._issue_counts[key]
+        self._issue_counts.pop(proxy, None)
         self._clear_consecutive_for_proxy(proxy)
         self._recover_source(proxy)
 
     def increment_consecutive_error(self, proxy: str | None, error_code: str) -> int:
-        key = (self._make_key(proxy), error_code)
-        current = self._consecutive_errors.get(key, 0) + 1
-        self._consecutive_errors[key] = current
+        streaks = self._consecutive_errors.setdefault(proxy, {})
+        current = streaks.get(error_code, 0) + 1
+        streaks[error_code] = current
         return current
 
     def pool_snapshot(self) -> dict[str, Any]:
@@ -171,15 +205,10 @@ class ProxyPool:
         }
 
     def _clear_consecutive_for_proxy(self, proxy: str | None) -> None:
-        key = self._make_key(proxy)
-        for record_key in list(self._consecutive_errors.keys()):
-            if record_key[0] == key:
-                del self._consecutive_errors[record_key]
+        self._consecutive_errors.pop(proxy, None)
 
     def _note_issue_timestamp(self) -> None:
-        now = self._now()
-        self._recent_issue_ts.append(now)
-        self._trim_recent_issues(self._issue_window_sec)
+        self._recent_issue_ts.append(self._now())
 
     def _recent_issue_count(self, window_sec: int) -> int:
         self._trim_recent_issues(window_sec)
@@ -196,22 +225,17 @@ class ProxyPool:
         return self._now() + self._revive_after_sec
 
     def _prune_expired_blocks(self) -> None:
-        if not self._blocked_until:
+        heap = self._block_heap
+        if not heap:
             return
         now = self._now()
-        for proxy, expires_at in list(self._blocked_until.items()):
-            if expires_at is not None and expires_at <= now:
+        while heap and heap[0][0] <= now:
+            expires_at, proxy = heapq.heappop(heap)
+            # Срок в куче всегда число, поэтому .get() без отдельной проверки наличия ключа
+            # не спутает его ни с отсутствующим прокси, ни с бессрочным блоком (None).
+            if self._blocked_until.get(proxy) == expires_at:
                 del self._blocked_until[proxy]
 
-    def _is_proxy_blocked(self, proxy: str) -> bool:
-        expires_at = self._blocked_until.get(proxy)
-        if expires_at is None:
-            return proxy in self._blocked_until
-        if expires_at <= self._now():
-            del self._blocked_until[proxy]
-            return False
-        return True
-
     def _is_direct_blocked(self) -> bool:
         if not self._direct_blocked:
             return False
@@ -229,10 +253,8 @@ class ProxyPool:
                 self._direct_blocked = False
                 self._direct_blocked_until = None
             return
-        self._blocked_until.pop(proxy, None)
-
-    def _now(self) -> float:
-        return float(self._time_provider())
+        if proxy in self._blocked_until:
+            del self._blocked_until[proxy]
 
 
 class HttpEngine:
@@ -254,6 +276,8 @@ class HttpEngine:
                 "follow_redirects": True,
             }
         )
+        # Заголовки зависят только от UA: собираем их один раз, UA по-прежнему выбирается случайно.
+        self._headers_by_ua = {ua: build_request_headers(network, ua) for ua in network.user_agents}
         self._last_proxy: str | None = None
         self._url_timeout_counts: dict[str, int] = {}
 
@@ -264,9 +288,7 @@ class HttpEngine:
         for condition in request.wait_conditions:
             if condition.type == "delay":
                 time.sleep(float(condition.value))
-        headers = {"User-Agent": random.choice(self.network.user_agents)}
-        if self.network.accept_language:
-            headers["Accept-Language"] = self.network.accept_language
+        headers = self._headers_by_ua[pick_user_agent(self.network)]
         attempts = self.network.retry.max_attempts
         backoff = self.network.retry.backoff_sec
         for attempt in range(attempts):
@@ -296,6 +318,7 @@ class HttpEngine:
                         self._proxy_pool.mark_forbidden(proxy)
                     elif status == 407:
                         self._proxy_pool.mark_bad(proxy)
+                        self._client_factory.discard(proxy)
                     logger.warning(
                         "Ошибка HTTP, повтор с другим прокси",
                         extra={"url": request.url, "error": str(exc), "proxy": proxy},
@@ -351,6 +374,7 @@ class HttpEngine:
                 },
             )
             self._proxy_pool.mark_bad(proxy, reason="connect_timeout", log=True)
+            self._client_factory.discard(proxy)
         else:
             cause = exc.__cause__
             cause_text = str(cause or "")
@@ -369,6 +393,7 @@ class HttpEngine:
                     },
                 )
                 self._proxy_pool.mark_bad(proxy, reason="connection_refused", log=True)
+                self._client_factory.discard(proxy)
         if event:
             logger.error(
                 "HTTP-соединение через прокси не установлено, повторяем с новым источником",
@@ -418,10 +443,17 @@ class BrowserEngine:
             extra_page_preview_sec=network.browser_extra_page_preview_sec,
         )
         self._url_timeout_counts: dict[str, int] = {}
+        # Параметры сети не меняются за время жизни движка: переводим их в нужные единицы один раз.
+        self._timeout_ms = int(network.request_timeout_sec * 1000)
+        self._quick_attempts = max(1, network.retry.max_attempts)
+        self._quick_waits = tuple(float(value) for value in (network.retry.backoff_sec or []))
         self._preview_delay_sec = max(0.0, float(network.browser_preview_delay_sec or 0.0))
         self._preview_before_sec = max(
             0.0, float(network.browser_preview_before_behavior_sec or 0.0)
         )
+        self._preview_delay_ms = self._preview_delay_sec * 1000
+        self._preview_before_ms = self._preview_before_sec * 1000
+        self._blocked_resource_types = frozenset(network.browser_block_resource_types)
         if self._preview_delay_sec > 0:
             logger.info(
                 "Режим визуального предпросмотра включён",
@@ -444,12 +476,16 @@ class BrowserEngine:
                 )
         self._storage_state = storage_state_arg
         self._contexts: dict[str | None, Any] = {}
+        # Одна вкладка на контекст переиспользуется между успешными загрузками:
+        # создание страницы в Chromium — несколько CDP-запросов на каждый URL.
+        # При включённом поведенческом слое вкладки не переиспользуются (см. fetch_html).
+        self._pages: dict[str, Any] = {}
         self._last_proxy: str | None = None
 
     def fetch_html(self, request: EngineRequest) -> str:
-        quick_attempts = max(1, self.network.retry.max_attempts)
-        quick_waits = [float(value) for value in (self.network.retry.backoff_sec or [])]
-        extra_waits = [120, 240, 900]
+        quick_attempts = self._quick_attempts
+        quick_waits = self._quick_waits
+        extra_waits = _EXTENDED_RETRY_WAITS_SEC
         total_attempts = quick_attempts + len(extra_waits)
         used_proxies: set[str | None] = set()
         for attempt in range(total_attempts):
@@ -470,9 +506,9 @@ class BrowserEngine:
                 )
                 raise RuntimeError(str(exc)) from exc
             context = self._get_or_create_context(proxy)
-            page = context.new_page()
+            page = self._get_or_create_page(proxy, context)
+            page_reusable = False
             try:
-                page.set_default_timeout(self.network.request_timeout_sec * 1000)
                 logger.debug(
                     "Page navigation url=%s proxy=%s user_agent=%s cookies_loaded=%s headers=%s",
                     request.url,
@@ -497,7 +533,7 @@ class BrowserEngine:
                             "delay_sec": self._preview_before_sec,
                         },
                     )
-                    page.wait_for_timeout(self._preview_before_sec * 1000)
+                    page.wait_for_timeout(self._preview_before_ms)
                 behavior_meta = {"url": request.url, "proxy": proxy}
                 self._behavior.apply(
                     page,
@@ -517,7 +553,10 @@ class BrowserEngine:
                             "delay_sec": self._preview_delay_sec,
                         },
                     )
-                    page.wait_for_timeout(self._preview_delay_sec * 1000)
+                    page.wait_for_timeout(self._preview_delay_ms)
+                # Поведенческий слой ходит по истории вкладки (back/forward): на переиспользованной
+                # вкладке он ушёл бы на страницы прошлых загрузок, поэтому тогда вкладка одноразовая.
+                page_reusable = not self._behavior.enabled
                 return html
             except ProxyBannedError:
                 logger.warning(
@@ -597,13 +636,15 @@ class BrowserEngine:
                     raise RuntimeError(f"Не удалось загрузить {request.url}") from exc
                 time.sleep(wait)
             finally:
-                page.close()
+                # После ошибки вкладка может остаться в неопределённом состоянии —
+                # закрываем её, следующая попытка получит свежую.
+                if not page_reusable:
+                    self._close_page(proxy)
         raise RuntimeError(f"Не удалось загрузить {request.url}")
 
     def fetch_binary(self, url: str, proxy: str | None = None) -> tuple[bytes, str | None]:
         context = self._get_or_create_context(proxy)
-        timeout_ms = int(self.network.request_timeout_sec * 1000)
-        response = context.request.get(url, timeout=timeout_ms)
+        response = context.request.get(url, timeout=self._timeout_ms)
         if response.status != 200:
             raise RuntimeError(f"Не удалось загрузить ресурс {url}, статус {response.status}")
         logger.debug("Binary fetch via browser url=%s proxy=%s status=%s", url, proxy, response.status)
@@ -634,14 +675,23 @@ class BrowserEngine:
     def _apply_wait_conditions(self, page, conditions: Iterable[WaitCondition]) -> None:
         for condition in conditions:
             if condition.type == "delay":
-                time.sleep(float(condition.value))
+                # Sync-API Playwright обрабатывает события (route-обработчики, загрузки)
+                # только внутри своих вызовов: time.sleep заморозил бы страницу на время паузы.
+                page.wait_for_timeout(float(condition.value) * 1000)
             elif condition.type == "selector":
                 page.wait_for_selector(condition.value, timeout=condition.timeout_sec * 1000)
 
     def _perform_infinite_scroll(self, page, limit: int) -> None:
+        # Вместо фиксированной секунды на шаг ждём, пока лента догрузит товары и страница
+        # вырастет; если высота не изменилась за отведённое время, новых товаров больше нет.
         for _ in range(limit):
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-            page.wait_for_timeout(1000)
+            height = page.evaluate(_SCROLL_TO_BOTTOM_JS)
+            try:
+                page.wait_for_function(
+                    _PAGE_GREW_JS, arg=height, timeout=_SCROLL_GROWTH_TIMEOUT_MS
+                )
+            except self._timeout_error:
+                break
 
     def shutdown(self) -> None:
         for context in self._contexts.values():
@@ -649,6 +699,7 @@ class BrowserEngine:
         self._browser.close()
         self._playwright.stop()
         self._contexts.clear()
+        self._pages.clear()
 
     def mark_last_proxy_bad(self, reason: str | None = None) -> None:
         if self._last_proxy is None:
@@ -677,9 +728,33 @@ class BrowserEngine:
             if headers:
                 context_kwargs["extra_http_headers"] = headers
             context = self._browser.new_context(**context_kwargs)
+            if self._blocked_resource_types:
+                context.route("**/*", self._route_resource)
             self._contexts[key] = context
         return context
 
+    def _route_resource(self, route: Any) -> None:
+        # HTML читается из DOM, поэтому картинки/шрифты/медиа можно не скачивать;
+        # fetch_binary идёт через context.request и маршрутизацию не проходит.
+        if route.request.resource_type in self._blocked_resource_types:
+            route.abort()
+        else:
+            route.continue_()
+
+    def _get_or_create_page(self, proxy: str | None, context: Any):
+        key = proxy or "__direct__"
+        page = self._pages.get(key)
+        if page is None or page.is_closed():
+            page = context.new_page()
+            page.set_default_timeout(self._timeout_ms)
+            self._pages[key] = page
+        return page
+
+    def _close_page(self, proxy: str | None) -> None:
+        page = self._pages.pop(proxy or "__direct__", None)
+        if page is not None and not page.is_closed():
+            page.close()
+
     @property
     def last_proxy(self) -> str | None:
         return self._last_proxy
@@ -708,6 +783,7 @@ class BrowserEngine:
 
     def _dispose_context(self, proxy: str | None) -> None:
         key = proxy or "__direct__"
+        self._pages.pop(key, None)
         context = self._contexts.pop(key, None)
         if context:
             context.close()
@@ -835,8 +911,8 @@ class BrowserEngine:
         attempt_index: int,
         quick_attempts: int,
         total_attempts: int,
-        quick_waits: list[float],
-        extra_waits: list[int],
+        quick_waits: Sequence[float],
+        extra_waits: Sequence[int],
     ) -> float:
         if attempt_index >= total_attempts - 1:
             return 0.0
@@ -67,6 +67,10 @@ class SiteCrawler:
             fail_cooldown_seconds=self._fail_cooldown_seconds,
         )
         self.dedupe_strip = context.config.dedupe.strip_params_blacklist
+        # Проверка ответа нужна только для selector-условий: без них страницу не разбираем повторно.
+        self._wait_selectors = tuple(
+            str(condition.value) for condition in site.wait_conditions if condition.type == "selector"
+        )
         self._seen_urls: set[str] = set()
         self._existing_product_urls: set[str] = set(existing_product_urls or set())
         self.flush_products = max(1, flush_products) if flush_products else 0
@@ -356,19 +360,18 @@ class SiteCrawler:
         return html
 
     def _wait_conditions_met(self, html: str) -> bool:
+        if not self._wait_selectors:
+            return True
         soup = BeautifulSoup(html, "lxml")
-        for condition in self.site.wait_conditions:
-            if condition.type == "selector" and not soup.select(condition.value):
-                return False
-        return True
+        return all(soup.select_one(selector) is not None for selector in self._wait_selectors)
 
     def _prepare_behavior_config(self, base_behavior):
-        behavior = base_behavior.model_copy()
+        # Конфиги неизменяемы, поэтому без hover-переопределений базовый объект возвращается как есть.
         hover_targets = self.site.selectors.hover_targets
-        if hover_targets:
-            mouse_cfg = behavior.mouse.model_copy(update={"hover_selectors": hover_targets})
-            behavior = behavior.model_copy(update={"mouse": mouse_cfg})
-        return behavior
+        if not hover_targets:
+            return base_behavior
+        mouse_cfg = base_behavior.mouse.model_copy(update={"hover_selectors": hover_targets})
+        return base_behavior.model_copy(update={"mouse": mouse_cfg})
 
     def _build_behavior_context(self, category_url: str) -> BehaviorContext | None:
         behavior = self.context.config.runtime.behavior
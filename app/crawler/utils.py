@@ -41,6 +41,13 @@ def pick_user_agent(network: NetworkConfig) -> str:
     return random.choice(network.user_agents)
 
 
+def build_request_headers(network: NetworkConfig, user_agent: str) -> dict[str, str]:
+    headers = {"User-Agent": user_agent}
+    if network.accept_language:
+        headers["Accept-Language"] = network.accept_language
+    return headers
+
+
 def jitter_sleep(min_delay: float = 0.05, max_delay: float = 0.3) -> None:
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
@@ -9,13 +9,22 @@ from rich.logging import RichHandler
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
 _configured = False
+_console: Console | None = None
+
+
+def get_console() -> Console:
+    """Возвращает общую Rich-консоль процесса (создаётся при первом обращении)."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
 
 
 def configure_logging(level: LogLevel = "INFO") -> None:
     """Настраивает цветной логгер один раз за запуск."""
     global _configured
     if not _configured:
-        console = Console()
+        console = get_console()
         handlers: list[logging.Handler] = [
             RichHandler(console=console, show_path=False, markup=True)
         ]
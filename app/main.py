@@ -4,7 +4,7 @@ from app.cli import entrypoint
 
 
 def main() -> None:
-    """Делегирует выполнение Typer-приложению."""
+    """Делегирует выполнение argparse-CLI."""
     entrypoint()
 
 
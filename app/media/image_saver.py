@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import os
+import re
 from pathlib import Path
+from typing import Iterable
 from urllib.parse import urlparse
 
 import httpx
@@ -53,36 +55,31 @@ class ImageSaver:
                     )
                     proxy_to_use = None
             client = self._client_factory.get(proxy_to_use)
-            response = client.get(
+            with client.stream(
+                "GET",
                 url,
                 headers={"User-Agent": pick_user_agent(self.network)},
-            )
-            response.raise_for_status()
-            logger.debug("Image download via httpx url=%s proxy=%s", url, proxy_to_use)
-            if self._proxy_pool:
-                self._proxy_pool.reset_issue_counter(proxy_to_use)
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code == 403 and self._proxy_pool:
-                self._proxy_pool.mark_forbidden(proxy_to_use)
-            logger.warning(
-                "Не удалось скачать изображение",
-                extra={"url": url, "error": str(exc)},
-            )
-            return None
+            ) as response:
+                if not response.is_success:
+                    if response.status_code == 403 and self._proxy_pool:
+                        self._proxy_pool.mark_forbidden(proxy_to_use)
+                    logger.warning(
+                        "Не удалось скачать изображение",
+                        extra={"url": url, "error": f"HTTP {response.status_code}"},
+                    )
+                    return None
+                logger.debug("Image download via httpx url=%s proxy=%s", url, proxy_to_use)
+                path = self._target_path(url, title, fallback_id, response.headers.get("content-type"))
+                saved = self._store(path, response.iter_bytes(_STREAM_CHUNK_SIZE))
         except httpx.HTTPError as exc:
             logger.warning(
                 "Не удалось скачать изображение",
                 extra={"url": url, "error": str(exc)},
             )
             return None
-
-        return self._write_file(
-            url=url,
-            title=title,
-            fallback_id=fallback_id,
-            content=response.content,
-            content_type=response.headers.get("content-type"),
-        )
+        if self._proxy_pool:
+            self._proxy_pool.reset_issue_counter(proxy_to_use)
+        return saved
 
     def save_from_content(
         self,
@@ -95,26 +92,20 @@ class ImageSaver:
         if not content:
             return None
         logger.debug("Image download via Playwright url=%s", url)
-        return self._write_file(
-            url=url,
-            title=title,
-            fallback_id=fallback_id,
-            content=content,
-            content_type=content_type,
-        )
+        path = self._target_path(url, title, fallback_id, content_type)
+        return self._store(path, (content,))
 
     def close(self) -> None:
         self._client_factory.close()
 
-    def _write_file(
-        self,
-        *,
-        url: str,
-        title: str | None,
-        fallback_id: str,
-        content: bytes,
-        content_type: str | None,
-    ) -> str | None:
+    def _store(self, path: Path, chunks: Iterable[bytes]) -> str:
+        _write_chunks(path, chunks)
+        logger.info("Сохранено изображение товара", extra={"path": str(path)})
+        return str(path)
+
+    def _target_path(
+        self, url: str, title: str | None, fallback_id: str, content_type: str | None
+    ) -> Path:
         extension = _guess_extension(url, content_type)
         slug_source = title or "product"
         slug = _slugify(slug_source) or hashlib.md5(fallback_id.encode(), usedforsecurity=False).hexdigest()
@@ -124,10 +115,24 @@ class ImageSaver:
         if path.exists():
             suffix = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()[:6]
             path = self.image_dir / f"{slug}-{suffix}.{extension}"
+        return path
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """Пишет тело ответа на диск по частям; при обрыве загрузки не оставляет обрезанный файл."""
+    partial = path.with_name(f"{path.name}.part")
+    try:
+        with partial.open("wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
 
-        path.write_bytes(content)
-        logger.info("Сохранено изображение товара", extra={"path": str(path)})
-        return str(path)
 
 def _guess_extension(url: str, content_type: str | None) -> str:
     if content_type:
@@ -150,10 +155,12 @@ def _guess_extension(url: str, content_type: str | None) -> str:
     return "jpg"
 
 
+_SLUG_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9_]+")
+
+
 def _slugify(value: str) -> str:
     from unidecode import unidecode
 
-    ascii_value = unidecode(value)
-    clean = "".join(ch if ch.isalnum() or ch in {"-", "_"} else "-" for ch in ascii_value.lower())
-    clean = "-".join(filter(None, clean.split("-")))
+    # unidecode отдаёт ASCII, поэтому буквы и цифры после lower() — это ровно [a-z0-9].
+    clean = _SLUG_SEPARATOR_PATTERN.sub("-", unidecode(value).lower()).strip("-")
     return clean[:80]
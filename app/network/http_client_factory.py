@@ -4,6 +4,15 @@ from typing import Any, Dict
 
 import httpx
 
+# Между запросами краулер выдерживает паузы в несколько секунд (page/product delay),
+# а стандартный keepalive_expiry httpx — 5 секунд: соединение закрывалось бы до следующего
+# запроса и каждый раз заново проходило TCP/TLS-рукопожатие через прокси.
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
 
 class HttpClientFactory:
     """Кеширует httpx.Client по значению прокси."""
@@ -15,6 +24,7 @@ class HttpClientFactory:
             self._base_kwargs = dict(base_kwargs)
         else:
             self._base_kwargs = dict(kwargs)
+        self._base_kwargs.setdefault("limits", DEFAULT_LIMITS)
         self._clients: dict[str, httpx.Client] = {}
 
     def get(self, proxy: str | None) -> httpx.Client:
@@ -28,6 +38,12 @@ class HttpClientFactory:
             self._clients[key] = client
         return client
 
+    def discard(self, proxy: str | None) -> None:
+        """Закрывает клиент прокси, чтобы не держать соединения к отбракованному источнику."""
+        client = self._clients.pop(proxy or "__direct__", None)
+        if client is not None:
+            client.close()
+
     def close(self) -> None:
         for client in self._clients.values():
             client.close()
@@ -7,17 +7,15 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from dotenv import load_dotenv
-from rich.console import Console
 
 from app.config.loader import ConfigLoaderError, iter_site_configs, load_global_config
 from app.config.runtime_paths import resolve_path, resolve_str_path
 from app.crawler.service import CrawlService
-from app.logger import get_logger
+from app.logger import get_console, get_logger
 from app.runtime import RuntimeContext
 from app.state.storage import StateStore
 from app.sheets.writer import SheetsWriter
 
-console = Console()
 logger = get_logger(__name__)
 
 
@@ -53,7 +51,7 @@ class AgentRunner:
             global_config = load_global_config(options.config_path)
             site_configs = list(iter_site_configs(options.sites_dir))
         except ConfigLoaderError as exc:
-            console.print(f"[bold red]Ошибка конфигурации:[/bold red] {exc}")
+            get_console().print(f"[bold red]Ошибка конфигурации:[/bold red] {exc}")
             raise
 
         state_store = StateStore(global_config.state.database)
@@ -91,7 +89,7 @@ class AgentRunner:
             state_store.close()
 
     def _execute(self, context: RuntimeContext) -> None:
-        console.print(
+        get_console().print(
             f"[yellow]Контекст подготовлен[/yellow]: лист={context.spreadsheet_id}, "
             f"сайтов={len(context.sites)}, resume={context.resume}, "
             f"dry_run={context.dry_run}"
@@ -100,12 +98,12 @@ class AgentRunner:
         crawler = CrawlService(context, writer=writer)
         self.latest_results = crawler.collect()
         total_records = sum(len(result.records) for result in self.latest_results)
-        console.print(
+        get_console().print(
             f"[green]Обход завершён[/green]: сайтов={len(self.latest_results)}, "
             f"ссылок={total_records}"
         )
         if writer is None:
-            console.print("[cyan]Dry-run: запись в Google Sheets пропущена[/cyan]")
+            get_console().print("[cyan]Dry-run: запись в Google Sheets пропущена[/cyan]")
             return
         writer.finalize(self.latest_results)
-        console.print("[green]Данные записаны в Google Sheets[/green]")
+        get_console().print("[green]Данные записаны в Google Sheets[/green]")
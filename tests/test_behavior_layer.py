@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urljoin
+
+import pytest
 
 from app.config.models import (
     BehaviorMouseConfig,
@@ -10,7 +14,12 @@ from app.config.models import (
     DelayConfig,
     HumanBehaviorConfig,
 )
-from app.crawler.behavior import BehaviorContext, HumanBehaviorController
+from app.crawler.behavior import (
+    BehaviorContext,
+    HumanBehaviorController,
+    _absolute_url,
+    _url_root,
+)
 
 
 class _StubMouse:
@@ -68,12 +77,14 @@ class _StubPage:
         self.viewport_size = {"width": 1200, "height": 900}
         self._context = _StubContext()
         self._nodes: dict[str, list[Any]] = {}
+        self.evaluated: list[tuple[str, tuple[Any, ...]]] = []
+        self.waited_ms: list[float] = []
 
-    def evaluate(self, script: str, *args: Any) -> None:  # noqa: ARG002
-        return
+    def evaluate(self, script: str, *args: Any) -> None:
+        self.evaluated.append((script, args))
 
-    def wait_for_timeout(self, ms: int) -> None:  # noqa: ARG002
-        return
+    def wait_for_timeout(self, ms: float) -> None:
+        self.waited_ms.append(ms)
 
     def query_selector_all(self, selector: str) -> list[Any]:
         return self._nodes.get(selector, [])
@@ -260,3 +271,94 @@ def test_behavior_scroll_respects_context_limits() -> None:
         numeric_values.append(int(value))
     assert numeric_values
     assert max(numeric_values) <= 25
+
+
+def test_behavior_controller_is_reproducible_with_seeded_rng() -> None:
+    config = HumanBehaviorConfig(
+        enabled=True,
+        action_delay=_zero_delay(),
+        scroll=BehaviorScrollConfig(
+            probability=1.0,
+            skip_probability=0.0,
+            min_steps=2,
+            max_steps=5,
+            pause_between_steps=_zero_delay(),
+        ),
+        mouse=BehaviorMouseConfig(move_count_min=1, move_count_max=3, hover_probability=0.0),
+        navigation=BehaviorNavigationConfig(
+            back_probability=0.0,
+            extra_products_probability=0.0,
+            visit_root_probability=0.0,
+        ),
+    )
+
+    def _run(seed: int) -> list[str]:
+        controller = HumanBehaviorController(
+            config, default_timeout_sec=5.0, rng=random.Random(seed)
+        )
+        return controller.apply(_StubPage(), context=None).actions
+
+    assert _run(42) == _run(42)
+
+
+def test_absolute_url_matches_urljoin() -> None:
+    hrefs = ["/p/1", "//cdn.example/img", "p/2", "?page=2", "/a/../b", "https://other.example/x"]
+    for base_url in ("https://shop.example/catalog/?page=1", ""):
+        base_root = _url_root(base_url)
+        for href in hrefs:
+            assert _absolute_url(base_url, base_root, href) == urljoin(base_url, href)
+
+
+def test_behavior_scroll_runs_all_steps_in_one_evaluate() -> None:
+    config = HumanBehaviorConfig(
+        enabled=True,
+        action_delay=_zero_delay(),
+        scroll=BehaviorScrollConfig(
+            probability=1.0,
+            skip_probability=0.0,
+            min_steps=4,
+            max_steps=4,
+            pause_between_steps=DelayConfig(min_sec=0.1, max_sec=0.2),
+        ),
+        mouse=BehaviorMouseConfig(move_count_min=0, move_count_max=0, hover_probability=0.0),
+        navigation=BehaviorNavigationConfig(
+            back_probability=0.0,
+            extra_products_probability=0.0,
+            visit_root_probability=0.0,
+        ),
+    )
+    controller = HumanBehaviorController(config, default_timeout_sec=5.0)
+    page = _StubPage()
+
+    result = controller.apply(page, context=None)
+
+    plan_calls = [args for _, args in page.evaluated if args]
+    assert len(plan_calls) == 1
+    plan = plan_calls[0][0]
+    assert len(plan) == 4
+    assert all(100.0 <= pause_ms <= 200.0 for _, pause_ms in plan)
+    assert len([action for action in result.actions if action.startswith("scroll:")]) >= 4
+
+
+def test_behavior_waits_through_page_timer(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "app.crawler.behavior.time.sleep",
+        lambda _: pytest.fail("time.sleep не должен вызываться при наличии wait_for_timeout"),
+    )
+    config = HumanBehaviorConfig(
+        enabled=True,
+        action_delay=DelayConfig(min_sec=0.5, max_sec=0.5),
+        scroll=BehaviorScrollConfig(probability=0.0),
+        mouse=BehaviorMouseConfig(move_count_min=2, move_count_max=2, hover_probability=0.0),
+        navigation=BehaviorNavigationConfig(
+            back_probability=0.0,
+            extra_products_probability=0.0,
+            visit_root_probability=0.0,
+        ),
+    )
+    controller = HumanBehaviorController(config, default_timeout_sec=5.0)
+    page = _StubPage()
+
+    controller.apply(page, context=None)
+
+    assert page.waited_ms == [500.0, 500.0]
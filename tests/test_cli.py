@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import app.cli as cli
+from app.cli import build_parser, parse_args
+
+
+def test_run_command_parses_common_options(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GLOBAL_CONFIG_PATH", raising=False)
+    monkeypatch.delenv("SITE_CONFIG_DIR", raising=False)
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    config_path = tmp_path / "global.yml"
+    config_path.write_text("{}", encoding="utf-8")
+
+    args = parse_args(
+        [
+            "run",
+            "--config",
+            str(config_path),
+            "--sites-dir",
+            str(tmp_path),
+            "--run-id",
+            "custom-run",
+            "--no-resume",
+            "--dry-run",
+        ]
+    )
+
+    assert args.command == "run"
+    assert args.config_path == config_path
+    assert args.sites_dir == tmp_path
+    assert args.run_id == "custom-run"
+    assert args.resume is False
+    assert args.reset_state is False
+    assert args.dry_run is True
+    assert args.log_level == "INFO"
+
+
+def test_watch_command_reads_env_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GLOBAL_CONFIG_PATH", raising=False)
+    monkeypatch.setenv("SITE_CONFIG_DIR", str(tmp_path))
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+
+    args = parse_args(["watch", "--success-delay", "0", "--max-runs", "2"])
+
+    assert args.command == "watch"
+    assert args.config_path is None
+    assert args.sites_dir == tmp_path
+    assert args.log_level == "DEBUG"
+    assert args.resume is True
+    assert args.success_delay == 0.0
+    assert args.error_delay == 120.0
+    assert args.max_runs == 2
+
+
+def test_cli_rejects_missing_paths_and_invalid_limits(tmp_path: Path) -> None:
+    parser = build_parser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(["run", "--config", str(tmp_path / "missing.yml")])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["watch", "--max-runs", "0"])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["watch", "--error-delay", "-1"])
+
+
+def test_parser_is_built_once_and_env_read_per_parse(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert build_parser() is build_parser()
+    monkeypatch.delenv("SITE_CONFIG_DIR", raising=False)
+    assert parse_args(["run"]).sites_dir is None
+
+    monkeypatch.setenv("SITE_CONFIG_DIR", str(tmp_path))
+    assert parse_args(["run"]).sites_dir == tmp_path
+
+    monkeypatch.setenv("SITE_CONFIG_DIR", str(tmp_path / "missing"))
+    with pytest.raises(SystemExit):
+        parse_args(["run"])
+
+
+def test_watch_sleeps_only_between_runs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.workflow.runner as runner_module
+
+    runs: list[object] = []
+    sleeps: list[float] = []
+
+    class _FakeRunner:
+        def run(self, options: object) -> None:
+            runs.append(options)
+
+    monkeypatch.setattr(runner_module, "AgentRunner", _FakeRunner)
+    monkeypatch.setattr(cli.time, "sleep", sleeps.append)
+    monkeypatch.delenv("GLOBAL_CONFIG_PATH", raising=False)
+
+    args = parse_args(
+        ["watch", "--sites-dir", str(tmp_path), "--success-delay", "5", "--max-runs", "3"]
+    )
+    args.handler(args)
+
+    assert len(runs) == 3
+    assert sleeps == [5.0, 5.0]
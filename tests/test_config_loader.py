@@ -6,7 +6,13 @@ from pathlib import Path
 import pytest
 import yaml
 
-from app.config.loader import ConfigLoaderError, iter_site_configs, load_global_config
+from app.config.loader import (
+    _SITE_CACHE,
+    ConfigLoaderError,
+    iter_site_configs,
+    load_global_config,
+)
+from app.config.runtime_paths import resolve_str_path
 
 
 def _base_global_payload() -> dict:
@@ -82,6 +88,7 @@ def test_load_global_config_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("NETWORK_BROWSER_PREVIEW_BEFORE_BEHAVIOR_SEC", "2")
     monkeypatch.setenv("NETWORK_BROWSER_EXTRA_PAGE_PREVIEW_SEC", "1.5")
     monkeypatch.setenv("NETWORK_BROWSER_SLOW_MO_MS", "750")
+    monkeypatch.setenv("NETWORK_BROWSER_BLOCK_RESOURCE_TYPES", "image,font")
     monkeypatch.setenv("NETWORK_ACCEPT_LANGUAGE", "ru-RU")
     monkeypatch.setenv("STATE_DATABASE_PATH", "/tmp/env-state.db")
     monkeypatch.setenv("BEHAVIOR_ENABLED", "true")
@@ -106,6 +113,7 @@ def test_load_global_config_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
     assert config.network.browser_preview_before_behavior_sec == 2.0
     assert config.network.browser_extra_page_preview_sec == 1.5
     assert config.network.browser_slow_mo_ms == 750
+    assert config.network.browser_block_resource_types == ["image", "font"]
     assert config.runtime.behavior.enabled is True
     assert config.runtime.behavior.mouse.move_count_min == 2
     assert config.runtime.behavior.navigation.extra_products_limit == 1
@@ -139,6 +147,22 @@ def test_state_path_defaults_follow_run_env(monkeypatch: pytest.MonkeyPatch) ->
         assert not local_default_storage.exists()
     else:
         assert local_config.network.browser_storage_state_path == local_default_storage
+
+
+def test_resolve_str_path_follows_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SITE_CONFIG_DIR", raising=False)
+    monkeypatch.setenv("APP_RUN_ENV", "docker")
+    kwargs = {"local_default": "config/sites", "docker_default": "/app/config/sites"}
+    assert resolve_str_path("SITE_CONFIG_DIR", **kwargs) == "/app/config/sites"
+    assert resolve_str_path("SITE_CONFIG_DIR", **kwargs) == "/app/config/sites"
+
+    monkeypatch.setenv("APP_RUN_ENV", "local")
+    assert resolve_str_path("SITE_CONFIG_DIR", **kwargs) == "config/sites"
+
+    monkeypatch.setenv("SITE_CONFIG_DIR", "/custom/sites")
+    assert resolve_str_path("SITE_CONFIG_DIR", **kwargs) == "/custom/sites"
+
+
 def test_iter_site_configs_supports_multiple_files(tmp_path: Path) -> None:
     (tmp_path / "first.yml").write_text(
         yaml.safe_dump(_site_payload("first")), encoding="utf-8"
@@ -157,3 +181,88 @@ def test_invalid_site_config_raises(tmp_path: Path) -> None:
 
     with pytest.raises(ConfigLoaderError):
         list(iter_site_configs(tmp_path))
+
+
+def test_load_global_config_from_env_is_cached_per_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SHEET_SPREADSHEET_ID", "CACHED_SHEET")
+    monkeypatch.setenv("NETWORK_USER_AGENTS", "agent-1")
+
+    first = load_global_config(None)
+    second = load_global_config(None)
+    assert first is second
+
+    monkeypatch.setenv("SHEET_SPREADSHEET_ID", "UPDATED_SHEET")
+    updated = load_global_config(None)
+    assert updated is not first
+    assert updated.sheet.spreadsheet_id == "UPDATED_SHEET"
+
+
+def test_iter_site_configs_reuses_unchanged_files(tmp_path: Path) -> None:
+    site_file = tmp_path / "cached.yml"
+    site_file.write_text(yaml.safe_dump(_site_payload("cached")), encoding="utf-8")
+
+    first = list(iter_site_configs(tmp_path))
+    second = list(iter_site_configs(tmp_path))
+    assert first[0] is second[0]
+    cache_size = len(_SITE_CACHE)
+
+    site_file.write_text(yaml.safe_dump(_site_payload("changed-name")), encoding="utf-8")
+    updated = list(iter_site_configs(tmp_path))
+    assert updated[0].name == "changed-name"
+    assert _SITE_CACHE[str(site_file)][2] is updated[0]
+    assert len(_SITE_CACHE) == cache_size
+
+
+def test_load_global_config_file_is_cached_until_changed(tmp_path: Path) -> None:
+    config_path = tmp_path / "global.yml"
+    payload = _base_global_payload()
+    config_path.write_text(yaml.safe_dump(payload), encoding="utf-8")
+
+    first = load_global_config(config_path)
+    assert load_global_config(config_path) is first
+
+    payload["sheet"]["spreadsheet_id"] = "UPDATED_SHEET_ID"
+    config_path.write_text(yaml.safe_dump(payload), encoding="utf-8")
+    assert load_global_config(config_path).sheet.spreadsheet_id == "UPDATED_SHEET_ID"
+
+
+def test_site_config_requires_categories_and_positive_page_overrides(tmp_path: Path) -> None:
+    empty_categories = _site_payload("empty")
+    empty_categories["category_urls"] = []
+    (tmp_path / "empty.yml").write_text(yaml.safe_dump(empty_categories), encoding="utf-8")
+    with pytest.raises(ConfigLoaderError, match="минимум один category_url"):
+        list(iter_site_configs(tmp_path))
+
+    (tmp_path / "empty.yml").unlink()
+    bad_pages = _site_payload("bad-pages")
+    bad_pages["category_pages"] = {"https://example.com/catalog": 0}
+    (tmp_path / "bad.yml").write_text(yaml.safe_dump(bad_pages), encoding="utf-8")
+    with pytest.raises(ConfigLoaderError, match="category_pages для https://example.com/catalog"):
+        list(iter_site_configs(tmp_path))
+
+
+def test_env_config_picks_up_storage_state_created_later(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("APP_RUN_ENV", "local")
+    monkeypatch.setenv("SHEET_SPREADSHEET_ID", "STATE_SHEET")
+    monkeypatch.setenv("NETWORK_USER_AGENTS", "agent-1")
+    monkeypatch.delenv("NETWORK_BROWSER_STORAGE_STATE_PATH", raising=False)
+
+    assert load_global_config(None).network.browser_storage_state_path is None
+
+    (tmp_path / "secrets").mkdir()
+    (tmp_path / "secrets" / "auth.json").write_text("{}", encoding="utf-8")
+    assert load_global_config(None).network.browser_storage_state_path == Path("secrets/auth.json")
+
+
+def test_iter_site_configs_yields_valid_files_before_a_broken_one(tmp_path: Path) -> None:
+    (tmp_path / "a-good.yml").write_text(yaml.safe_dump(_site_payload("good")), encoding="utf-8")
+    (tmp_path / "b-broken.yml").write_text(yaml.safe_dump({"site": {}}), encoding="utf-8")
+
+    configs = iter_site_configs(tmp_path)
+
+    assert next(configs).name == "good"
+    with pytest.raises(ConfigLoaderError, match="b-broken.yml"):
+        next(configs)
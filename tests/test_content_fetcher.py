@@ -11,26 +11,32 @@ from app.crawler.content_fetcher import (
     _extract_main_image_url,
     _extract_text_content,
     _extract_text_by_selector,
+    _extract_title,
+    _pick_best_srcset,
     _clean_price_text,
+    parse_product_html,
 )
 from app.crawler.engines import ProxyPool
 
 
 class _FakeResponse:
-    def __init__(self, text: str = "<html></html>") -> None:
-        self.text = text
-
-    def raise_for_status(self) -> None:
-        return None
+    def __init__(
+        self, content: bytes = b"<html></html>", encoding: str = "utf-8", status_code: int = 200
+    ) -> None:
+        self.content = content
+        self.encoding = encoding
+        self.status_code = status_code
+        self.is_success = 200 <= status_code < 300
 
 
 class _RecordingHttpClient:
-    def __init__(self) -> None:
+    def __init__(self, status_code: int = 200) -> None:
         self.calls: list[dict[str, object]] = []
+        self.status_code = status_code
 
     def get(self, url: str, *, headers: dict[str, str]):
         self.calls.append({"url": url, "headers": headers})
-        return _FakeResponse()
+        return _FakeResponse(status_code=self.status_code)
 
 
 class _FakeClientFactory:
@@ -90,6 +96,19 @@ def test_extract_text_content_drops_after_selector():
     assert text == "Описание товара с выделением"
 
 
+def test_extract_text_content_drops_nested_tail():
+    html = """
+    <main>
+      <section>Верх <div><p class='cut'>Отзывы</p><span>Вложенный хвост</span></div></section>
+      <section>Соседний хвост</section>
+    </main>
+    <footer>Подвал</footer>
+    """
+    soup = BeautifulSoup(html, "lxml")
+    text = _extract_text_content(soup, ["p.cut"])
+    assert text == "Верх"
+
+
 def test_extract_text_content_excludes_specific_blocks():
     html = """
     <div>Основное описание</div>
@@ -137,6 +156,25 @@ def test_extract_main_image_prefers_highest_descriptor():
     assert url == "https://example.com/a-2x.webp"
 
 
+def test_og_meta_tags_are_found_in_body_when_head_lacks_them():
+    html = (
+        "<html><head><link rel='stylesheet' href='/s.css'></head><body>"
+        "<meta property='og:title' content='Good'><meta property='og:image' content='/i.jpg'>"
+        "<h1>H</h1></body></html>"
+    )
+    soup = BeautifulSoup(html, "lxml")
+    assert _extract_title(soup) == "Good"
+    assert _extract_main_image_url(soup, "https://example.com/p") == "https://example.com/i.jpg"
+
+
+def test_pick_best_srcset_prefers_width_and_tolerates_spacing():
+    base = "https://example.com/product/"
+    assert _pick_best_srcset("a.jpg 1x,\n  b.jpg   2x", base) == "https://example.com/product/b.jpg"
+    assert _pick_best_srcset("a.jpg 3x, b.jpg 300w, c.jpg 600w", base) == "https://example.com/product/c.jpg"
+    assert _pick_best_srcset("a.jpg, b.jpg", base) == "https://example.com/product/a.jpg"
+    assert _pick_best_srcset(" , ", base) is None
+
+
 def test_extract_image_from_node_understands_picture_sources():
     html = """
     <picture class="image">
@@ -154,16 +192,32 @@ def test_fetch_html_http_passes_proxy_into_httpx(tmp_path):
     network = NetworkConfig(
         user_agents=["UA"],
         proxy_pool=["http://proxy.local:8080"],
+        accept_language="ru-RU",
     )
     fetcher = ProductContentFetcher(network, Path(tmp_path))
     fake_client = _RecordingHttpClient()
     factory = _FakeClientFactory(fake_client)
     fetcher._http_client_factory = factory  # type: ignore[assignment]
     fetcher._proxy_pool = ProxyPool(["http://proxy.local:8080"])
-    html, proxy = fetcher._fetch_html_http("https://example.com/product")
-    assert html == "<html></html>"
+    html, encoding, proxy = fetcher._fetch_html_http("https://example.com/product")
+    assert html == b"<html></html>"
+    assert encoding == "utf-8"
     assert proxy == "http://proxy.local:8080"
     assert factory.requested_proxies[-1] == "http://proxy.local:8080"
+    assert fake_client.calls[-1]["headers"] == {"User-Agent": "UA", "Accept-Language": "ru-RU"}
+
+
+def test_fetch_html_http_marks_proxy_forbidden_on_403(tmp_path):
+    network = NetworkConfig(user_agents=["UA"], proxy_pool=["http://proxy.local:8080"])
+    fetcher = ProductContentFetcher(network, Path(tmp_path))
+    fetcher._http_client_factory = _FakeClientFactory(_RecordingHttpClient(status_code=403))  # type: ignore[assignment]
+    forbidden: list[str | None] = []
+    pool = ProxyPool(["http://proxy.local:8080"])
+    pool.mark_forbidden = forbidden.append  # type: ignore[method-assign]
+    fetcher._proxy_pool = pool
+
+    assert fetcher._fetch_html_http("https://example.com/product") == (None, None, "http://proxy.local:8080")
+    assert forbidden == ["http://proxy.local:8080"]
 
 
 def test_clean_price_text_extracts_amount_and_currency():
@@ -209,7 +263,7 @@ def test_product_cooldown_waits_after_streak(monkeypatch, tmp_path):
     )
 
     def fake_fetch_html_http(self, product_url: str):
-        return None, None
+        return None, None, None
 
     monkeypatch.setattr(ProductContentFetcher, "_fetch_html_http", fake_fetch_html_http, raising=False)
 
@@ -244,3 +298,36 @@ def test_fetch_falls_back_to_http_when_browser_binary_fails(tmp_path):
 
     assert result.price_with_discount == "5 500,50 руб."
     assert recorder.saved_http
+
+
+def test_parse_product_html_works_without_network():
+    html = """
+    <html><head><title>Карточка</title></head><body>
+      <h1 class="name">Widget</h1>
+      <span class="price">1 290 ₽</span>
+      <img class="main" src="/img/widget.jpg">
+      <p>Описание</p>
+    </body></html>
+    """
+    content = parse_product_html(
+        html,
+        "https://example.com/p/1",
+        image_selector="img.main",
+        name_en_selector="h1.name",
+        price_with_discount_selector=".price",
+    )
+
+    assert content.title == "Карточка"
+    assert content.name_en == "Widget"
+    assert content.image_url == "https://example.com/img/widget.jpg"
+    assert content.image_path is None
+    assert "Описание" in content.text_content
+
+
+def test_parse_product_html_decodes_raw_bytes_with_response_encoding():
+    html = "<html><head><title>Чайник</title></head><body><p>Сталь</p></body></html>"
+
+    content = parse_product_html(html.encode("cp1251"), "https://example.com/p/2", encoding="windows-1251")
+
+    assert content.title == "Чайник"
+    assert content.text_content == "Чайник Сталь"
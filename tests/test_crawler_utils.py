@@ -1,4 +1,5 @@
-from app.crawler.utils import normalize_url
+from app.config.models import NetworkConfig
+from app.crawler.utils import build_request_headers, normalize_url
 
 
 def test_normalize_url_removes_tracking_params() -> None:
@@ -9,3 +10,9 @@ def test_normalize_url_removes_tracking_params() -> None:
     )
     assert url == "https://example.com/item?id=123"
     assert len(url_hash) == 32
+
+
+def test_build_request_headers_adds_accept_language_when_configured() -> None:
+    assert build_request_headers(NetworkConfig(user_agents=["UA"]), "UA") == {"User-Agent": "UA"}
+    network = NetworkConfig(user_agents=["UA"], accept_language="ru-RU")
+    assert build_request_headers(network, "UA") == {"User-Agent": "UA", "Accept-Language": "ru-RU"}
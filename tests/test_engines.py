@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from app.config.models import NetworkConfig, PaginationConfig, WaitCondition
+from app.crawler.engines import BrowserEngine, EngineRequest, ProxyPool
+
+
+class _FakeTimeout(Exception):
+    pass
+
+
+class _ScrollPage:
+    def __init__(self, growth_steps: int) -> None:
+        self.height = 1000
+        self.growth_steps = growth_steps
+        self.scrolls = 0
+        self.timeouts: list[int] = []
+
+    def evaluate(self, script: str) -> int:
+        self.scrolls += 1
+        return self.height
+
+    def wait_for_function(self, script: str, *, arg: int, timeout: int) -> None:
+        self.timeouts.append(timeout)
+        if self.growth_steps <= 0:
+            raise _FakeTimeout
+        self.growth_steps -= 1
+        self.height = arg + 500
+
+
+def _bare_engine() -> BrowserEngine:
+    engine = object.__new__(BrowserEngine)
+    engine._timeout_error = _FakeTimeout  # type: ignore[attr-defined]
+    return engine
+
+
+def test_infinite_scroll_stops_when_page_stops_growing() -> None:
+    page = _ScrollPage(growth_steps=2)
+
+    _bare_engine()._perform_infinite_scroll(page, limit=30)
+
+    assert page.scrolls == 3
+    assert page.height == 2000
+
+
+def test_infinite_scroll_respects_limit() -> None:
+    page = _ScrollPage(growth_steps=100)
+
+    _bare_engine()._perform_infinite_scroll(page, limit=5)
+
+    assert page.scrolls == 5
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+        self.default_timeout: float | None = None
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def set_default_timeout(self, value: float) -> None:
+        self.default_timeout = value
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[_FakePage] = []
+
+    def new_page(self) -> _FakePage:
+        page = _FakePage()
+        self.pages.append(page)
+        return page
+
+
+def test_browser_pages_are_reused_until_closed() -> None:
+    engine = _bare_engine()
+    engine._timeout_ms = 15000  # type: ignore[attr-defined]
+    engine._pages = {}  # type: ignore[attr-defined]
+    context = _FakeContext()
+
+    first = engine._get_or_create_page("http://proxy1", context)
+    assert engine._get_or_create_page("http://proxy1", context) is first
+    assert first.default_timeout == 15000
+
+    engine._close_page("http://proxy1")
+    assert first.closed
+    assert engine._get_or_create_page("http://proxy1", context) is not first
+    assert len(context.pages) == 2
+
+
+class _FakeRoute:
+    def __init__(self, resource_type: str) -> None:
+        self.request = type("_Request", (), {"resource_type": resource_type})()
+        self.outcome: str | None = None
+
+    def abort(self) -> None:
+        self.outcome = "abort"
+
+    def continue_(self) -> None:
+        self.outcome = "continue"
+
+
+def test_browser_route_blocks_only_configured_resource_types() -> None:
+    engine = _bare_engine()
+    engine._blocked_resource_types = frozenset({"image", "font"})  # type: ignore[attr-defined]
+    image, document = _FakeRoute("image"), _FakeRoute("document")
+
+    engine._route_resource(image)
+    engine._route_resource(document)
+
+    assert image.outcome == "abort"
+    assert document.outcome == "continue"
+
+
+class _WaitingPage:
+    def __init__(self) -> None:
+        self.waits: list[tuple[str, float]] = []
+
+    def wait_for_timeout(self, timeout: float) -> None:
+        self.waits.append(("timeout", timeout))
+
+    def wait_for_selector(self, selector: str, *, timeout: float) -> None:
+        self.waits.append((selector, timeout))
+
+
+def test_browser_delay_conditions_wait_inside_playwright() -> None:
+    page = _WaitingPage()
+    conditions = [
+        WaitCondition(type="delay", value="1.5"),
+        WaitCondition(type="selector", value=".product", timeout_sec=4),
+    ]
+
+    _bare_engine()._apply_wait_conditions(page, conditions)
+
+    assert page.waits == [("timeout", 1500.0), (".product", 4000)]
+
+
+class _HistoryPage(_FakePage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.history: list[str] = []
+
+    def goto(self, url: str, *, wait_until: str) -> None:
+        self.history.append(url)
+
+    def go_back(self) -> str | None:
+        return self.history[-2] if len(self.history) > 1 else None
+
+    def content(self) -> str:
+        return f"<html>{self.history[-1]}</html>"
+
+
+class _HistoryContext(_FakeContext):
+    def new_page(self) -> _HistoryPage:
+        page = _HistoryPage()
+        self.pages.append(page)
+        return page
+
+
+class _HistoryBehavior:
+    """Имитирует шаг back поведенческого слоя и запоминает, куда он привёл бы."""
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.back_targets: list[str | None] = []
+
+    def apply(self, page: _HistoryPage, *, context: object, meta: dict) -> None:
+        if self.enabled:
+            self.back_targets.append(page.go_back())
+
+
+def _fetching_engine(behavior: _HistoryBehavior) -> tuple[BrowserEngine, _HistoryContext]:
+    engine = _bare_engine()
+    context = _HistoryContext()
+    engine.network = NetworkConfig(user_agents=["agent"])  # type: ignore[attr-defined]
+    engine._proxy_pool = ProxyPool([], allow_direct=True)  # type: ignore[attr-defined]
+    engine._quick_attempts = 1  # type: ignore[attr-defined]
+    engine._quick_waits = ()  # type: ignore[attr-defined]
+    engine._timeout_ms = 15000  # type: ignore[attr-defined]
+    engine._contexts = {"__direct__": context}  # type: ignore[attr-defined]
+    engine._pages = {}  # type: ignore[attr-defined]
+    engine._storage_state = None  # type: ignore[attr-defined]
+    engine._preview_before_sec = 0.0  # type: ignore[attr-defined]
+    engine._preview_delay_sec = 0.0  # type: ignore[attr-defined]
+    engine._url_timeout_counts = {}  # type: ignore[attr-defined]
+    engine._last_proxy = None  # type: ignore[attr-defined]
+    engine._behavior = behavior  # type: ignore[attr-defined]
+    return engine, context
+
+
+def _request(url: str) -> EngineRequest:
+    return EngineRequest(
+        url=url, wait_conditions=[], pagination=PaginationConfig(mode="numbered_pages")
+    )
+
+
+def test_behavior_history_actions_stay_within_current_fetch() -> None:
+    behavior = _HistoryBehavior(enabled=True)
+    engine, context = _fetching_engine(behavior)
+
+    assert engine.fetch_html(_request("https://shop.test/a")) == "<html>https://shop.test/a</html>"
+    assert engine.fetch_html(_request("https://shop.test/b")) == "<html>https://shop.test/b</html>"
+
+    # каждая загрузка идёт в свежей вкладке: back не уводит на страницу прошлой загрузки
+    assert behavior.back_targets == [None, None]
+    assert len(context.pages) == 2
+    assert all(page.closed for page in context.pages)
+
+
+def test_pages_are_reused_across_fetches_without_behavior() -> None:
+    engine, context = _fetching_engine(_HistoryBehavior(enabled=False))
+
+    engine.fetch_html(_request("https://shop.test/a"))
+    engine.fetch_html(_request("https://shop.test/b"))
+
+    assert len(context.pages) == 1
+    assert context.pages[0].history == ["https://shop.test/a", "https://shop.test/b"]
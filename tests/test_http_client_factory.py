@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from app.network.http_client_factory import HttpClientFactory
+import httpx
+
+from app.network.http_client_factory import DEFAULT_LIMITS, HttpClientFactory
 
 
 def test_http_client_factory_reuses_clients_per_proxy():
@@ -12,3 +14,37 @@ def test_http_client_factory_reuses_clients_per_proxy():
     assert client_a is client_b
     assert client_a is not client_direct
     factory.close()
+
+
+def test_http_client_factory_keeps_connections_alive_between_delays(monkeypatch):
+    captured: list[dict] = []
+
+    class _RecordingClient:
+        def __init__(self, **kwargs):
+            captured.append(kwargs)
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(httpx, "Client", _RecordingClient)
+    HttpClientFactory(base_kwargs={"timeout": 5}).get(None)
+    custom = httpx.Limits(max_connections=1)
+    HttpClientFactory(timeout=5, limits=custom).get(None)
+
+    assert captured[0]["limits"] is DEFAULT_LIMITS
+    assert DEFAULT_LIMITS.keepalive_expiry == 60.0
+    assert captured[1]["limits"] is custom
+
+
+def test_http_client_factory_discard_closes_only_that_proxy():
+    factory = HttpClientFactory(base_kwargs={"timeout": 5})
+    bad = factory.get("http://proxy-a:8080")
+    direct = factory.get(None)
+
+    factory.discard("http://proxy-a:8080")
+    factory.discard("http://unknown:8080")
+
+    assert bad.is_closed
+    assert not direct.is_closed
+    assert factory.get("http://proxy-a:8080") is not bad
+    factory.close()
@@ -1,6 +1,26 @@
 from __future__ import annotations
 
-from app.media.image_saver import _guess_extension
+from pathlib import Path
+
+import httpx
+
+from app.config.models import NetworkConfig
+from app.crawler.engines import ProxyPool
+from app.media.image_saver import ImageSaver, _guess_extension, _slugify
+
+
+class _MockClientFactory:
+    def __init__(self, status_code: int) -> None:
+        self.client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    status_code, content=b"img", headers={"content-type": "image/png"}
+                )
+            )
+        )
+
+    def get(self, proxy: str | None) -> httpx.Client:
+        return self.client
 
 
 def test_guess_extension_prefers_content_type():
@@ -14,3 +34,50 @@ def test_guess_extension_falls_back_to_url():
     url = "https://cdn.example.com/promo/shot.webp?size=large"
     assert _guess_extension(url, None) == "webp"
     assert _guess_extension("https://cdn.example.com/logo.svg", None) == "svg"
+
+
+def test_save_skips_error_status_and_marks_forbidden_proxy(tmp_path: Path):
+    saver = ImageSaver(NetworkConfig(user_agents=["UA"]), tmp_path, proxy_pool=ProxyPool([]))
+    forbidden: list[str | None] = []
+    saver._proxy_pool.mark_forbidden = forbidden.append  # type: ignore[union-attr, method-assign]
+
+    saver._client_factory = _MockClientFactory(403)  # type: ignore[assignment]
+    assert saver.save("https://cdn.example.com/a.png", "Товар", "id-1", proxy="http://p:1") is None
+    assert forbidden == ["http://p:1"]
+
+    saver._client_factory = _MockClientFactory(200)  # type: ignore[assignment]
+    saved = saver.save("https://cdn.example.com/a.png", "Товар", "id-1", proxy="http://p:1")
+    assert saved is not None and Path(saved).read_bytes() == b"img"
+
+
+def test_slugify_transliterates_and_collapses_separators():
+    assert _slugify("Чайник  Tefal -- 1,7 л!") == "chainik-tefal-1-7-l"
+    assert _slugify("a_-_b") == "a_-_b"
+    assert _slugify(" -- ") == ""
+
+
+class _BrokenStream(httpx.SyncByteStream):
+    def __iter__(self):
+        yield b"first-chunk"
+        raise httpx.ReadError("connection reset")
+
+
+def test_save_discards_partial_file_when_stream_breaks(tmp_path: Path):
+    saver = ImageSaver(NetworkConfig(user_agents=["UA"]), tmp_path)
+    factory = _MockClientFactory(200)
+    factory.client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=_BrokenStream()))
+    )
+    saver._client_factory = factory  # type: ignore[assignment]
+
+    assert saver.save("https://cdn.example.com/a.png", "Товар", "id-1") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_from_content_writes_file_without_partial_leftovers(tmp_path: Path):
+    saver = ImageSaver(NetworkConfig(user_agents=["UA"]), tmp_path)
+
+    saved = saver.save_from_content("https://cdn.example.com/b", "Товар", "id-2", b"png", "image/png")
+
+    assert saved is not None and Path(saved).read_bytes() == b"png"
+    assert [path.name for path in tmp_path.iterdir()] == ["tovar.png"]
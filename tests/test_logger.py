@@ -18,3 +18,18 @@ def test_configure_logging_creates_file(tmp_path, monkeypatch):
 
     assert log_path.exists()
     assert "file sink ready" in log_path.read_text()
+
+
+def test_rich_handler_and_messages_share_one_console(monkeypatch):
+    monkeypatch.delenv("LOG_FILE_PATH", raising=False)
+
+    import app.logger as logger_module
+    from rich.logging import RichHandler
+
+    logger_module = importlib.reload(logger_module)
+    logger_module.configure_logging("INFO")
+
+    console = logger_module.get_console()
+    assert logger_module.get_console() is console
+    rich_handlers = [h for h in logging.getLogger().handlers if isinstance(h, RichHandler)]
+    assert rich_handlers[0].console is console
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import pytest
@@ -18,6 +19,7 @@ def test_proxy_pool_marks_after_two_issues(tmp_path: Path) -> None:
     assert log_path.exists()
     content = log_path.read_text(encoding="utf-8")
     assert "empty_page" in content
+    assert re.match(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ\thttp://proxy1\t", content)
 
 
 def test_proxy_pool_reset_issue_counter(tmp_path: Path) -> None:
@@ -33,8 +35,10 @@ def test_proxy_pool_consecutive_errors_reset() -> None:
     pool = ProxyPool(["http://proxy1"])
     assert pool.increment_consecutive_error("http://proxy1", "ERR_TEST") == 1
     assert pool.increment_consecutive_error("http://proxy1", "ERR_TEST") == 2
+    assert pool.increment_consecutive_error("http://proxy2", "ERR_TEST") == 1
     pool.reset_issue_counter("http://proxy1")
     assert pool.increment_consecutive_error("http://proxy1", "ERR_TEST") == 1
+    assert pool.increment_consecutive_error("http://proxy2", "ERR_TEST") == 2
 
 
 def test_proxy_pool_snapshot_counts() -> None:
@@ -91,3 +95,103 @@ def test_proxy_pool_reset_issue_counter_unblocks_direct_connection() -> None:
 
     pool.reset_issue_counter(None)
     assert pool.pick() is None
+
+
+def test_proxy_pool_live_list_tracks_blocks_and_exclusions() -> None:
+    fake_time = [0.0]
+    pool = ProxyPool(
+        ["http://proxy1", "http://proxy2", "http://proxy3"],
+        revive_after_sec=60,
+        time_provider=lambda: fake_time[0],
+    )
+    pool.mark_bad("http://proxy2", reason="manual", log=False)
+    assert {pool.pick() for _ in range(50)} == {"http://proxy1", "http://proxy3"}
+    assert pool.pick(exclude={"http://proxy1"}) == "http://proxy3"
+
+    pool.reset_issue_counter("http://proxy2")
+    pool.mark_bad("http://proxy1", reason="manual", log=False)
+    pool.mark_bad("http://proxy3", reason="manual", log=False)
+    assert pool.pick() == "http://proxy2"
+
+    fake_time[0] = 120.0
+    assert {pool.pick() for _ in range(50)} == {"http://proxy1", "http://proxy2", "http://proxy3"}
+
+
+def test_proxy_pool_recent_issue_window_is_trimmed_on_snapshot() -> None:
+    fake_time = [0.0]
+    pool = ProxyPool(["http://proxy1"], time_provider=lambda: fake_time[0])
+    pool.register_issue("http://proxy1", reason="empty_page")
+    fake_time[0] = 200.0
+    pool.register_issue("http://proxy2", reason="empty_page")
+    assert pool.pool_snapshot()["recent_issue_count_5m"] == 2
+
+    fake_time[0] = 400.0
+    assert pool.pool_snapshot()["recent_issue_count_5m"] == 1
+
+
+def test_proxy_pool_rotates_through_all_live_proxies() -> None:
+    proxies = ["http://proxy1", "http://proxy2", "http://proxy3"]
+    pool = ProxyPool(proxies)
+
+    picks = [pool.pick() for _ in range(6)]
+
+    assert sorted(picks[:3]) == proxies
+    assert picks[3:] == picks[:3]
+
+
+def test_proxy_pool_ignores_stale_expirations_after_reblock() -> None:
+    fake_time = [0.0]
+    pool = ProxyPool(
+        ["http://proxy1", "http://proxy2"],
+        revive_after_sec=60,
+        time_provider=lambda: fake_time[0],
+    )
+    pool.mark_bad("http://proxy1", reason="test", log=False)
+    pool.reset_issue_counter("http://proxy1")
+    fake_time[0] = 30.0
+    pool.mark_bad("http://proxy1", reason="test", log=False)
+
+    # первый срок (60) устарел: прокси заблокирован повторно до 90
+    fake_time[0] = 61.0
+    assert pool.pool_snapshot()["bad_proxies"] == 1
+    assert pool.pick() == "http://proxy2"
+
+    fake_time[0] = 91.0
+    assert pool.pool_snapshot()["bad_proxies"] == 0
+
+
+def test_proxy_pool_logs_direct_connection_with_readable_token(tmp_path: Path) -> None:
+    log_path = tmp_path / "bad.log"
+    pool = ProxyPool([], allow_direct=True, bad_log_path=log_path)
+
+    pool.mark_forbidden(None)
+    assert not log_path.exists()
+    pool.mark_forbidden(None)
+
+    assert "\t__direct__\tHTTP 403" in log_path.read_text(encoding="utf-8")
+    with pytest.raises(ProxyExhaustedError):
+        pool.pick()
+
+
+def test_proxy_pool_falls_back_to_all_sources_when_everything_excluded() -> None:
+    pool = ProxyPool(["http://proxy1", "http://proxy2"], allow_direct=False)
+
+    picked = pool.pick(exclude={"http://proxy1", "http://proxy2"})
+
+    assert picked in {"http://proxy1", "http://proxy2"}
+
+
+def test_proxy_pool_rotation_stays_fair_across_blocks_and_exclusions() -> None:
+    proxies = ["http://proxy1", "http://proxy2", "http://proxy3", "http://proxy4"]
+    pool = ProxyPool(proxies, allow_direct=True)
+
+    first_cycle = [pool.pick() for _ in range(5)]
+    assert sorted(first_cycle, key=str) == sorted([*proxies, None], key=str)
+
+    # блокировка и исключение посреди цикла не сбивают порядок остальных источников
+    blocked = first_cycle[1]
+    pool.mark_bad(blocked, reason="test", log=False)
+    expected = [source for source in first_cycle if source != blocked]
+    assert pool.pick(exclude={expected[0]}) == expected[1]
+    assert [pool.pick() for _ in range(2)] == expected[2:]
+    assert [pool.pick() for _ in range(4)] == expected
@@ -6,7 +6,7 @@ from typing import Any
 
 import pytest
 
-from app.config.models import GlobalConfig, SiteConfig
+from app.config.models import GlobalConfig, SiteConfig, WaitCondition
 from app.crawler.content_fetcher import ProductContent
 from app.crawler.models import CategoryMetrics, ProductRecord
 from app.crawler.site_crawler import SiteCrawler
@@ -109,6 +109,14 @@ def _global_config(tmp_path: Path) -> GlobalConfig:
     )
 
 
+def _with_pagination(site: SiteConfig, **updates: object) -> SiteConfig:
+    return site.model_copy(update={"pagination": site.pagination.model_copy(update=updates)})
+
+
+def _with_runtime(config: GlobalConfig, **updates: object) -> GlobalConfig:
+    return config.model_copy(update={"runtime": config.runtime.model_copy(update=updates)})
+
+
 def test_site_crawler_numbered_pages(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
     config = _global_config(tmp_path)
@@ -163,7 +171,7 @@ def test_site_crawler_category_pages_override(
 ) -> None:
     site = _site_config()
     category_url = str(site.category_urls[0])
-    site.category_pages = {category_url: 2}
+    site = site.model_copy(update={"category_pages": {category_url: 2}})
     config = _global_config(tmp_path)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
@@ -198,7 +206,8 @@ def test_site_crawler_category_pages_override(
 def test_site_crawler_respects_global_stop(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
     config = _global_config(tmp_path)
-    config.runtime.global_stop.stop_after_products = 2
+    global_stop = config.runtime.global_stop.model_copy(update={"stop_after_products": 2})
+    config = _with_runtime(config, global_stop=global_stop)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
         run_id="run-1",
@@ -397,7 +406,7 @@ def test_site_crawler_retries_empty_category_twice(
 
 def test_site_crawler_respects_start_page(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
-    site.pagination.start_page = 3
+    site = _with_pagination(site, start_page=3)
     config = _global_config(tmp_path)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
@@ -439,7 +448,7 @@ def test_site_crawler_respects_start_page(monkeypatch: pytest.MonkeyPatch, tmp_p
 
 def test_site_crawler_respects_end_page(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
-    site.pagination.end_page = 2
+    site = _with_pagination(site, end_page=2)
     config = _global_config(tmp_path)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
@@ -519,7 +528,7 @@ def test_site_crawler_continues_after_empty_pages(monkeypatch: pytest.MonkeyPatc
 
 def test_site_crawler_stops_after_three_empty_pages(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
-    site.pagination.max_pages = 10
+    site = _with_pagination(site, max_pages=10)
     config = _global_config(tmp_path)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
@@ -560,8 +569,7 @@ def test_site_crawler_stops_after_three_empty_pages(monkeypatch: pytest.MonkeyPa
 def test_category_cooldown_flushes_buffer(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
     config = _global_config(tmp_path)
-    config.runtime.fail_cooldown_threshold = 2
-    config.runtime.fail_cooldown_seconds = 7
+    config = _with_runtime(config, fail_cooldown_threshold=2, fail_cooldown_seconds=7)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
         run_id="run-cooldown",
@@ -598,8 +606,7 @@ def test_category_cooldown_flushes_buffer(monkeypatch: pytest.MonkeyPatch, tmp_p
 def test_fetch_attempt_cooldown(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
     config = _global_config(tmp_path)
-    config.runtime.fail_cooldown_threshold = 2
-    config.runtime.fail_cooldown_seconds = 6
+    config = _with_runtime(config, fail_cooldown_threshold=2, fail_cooldown_seconds=6)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
         run_id="run-attempt",
@@ -636,8 +643,7 @@ def test_fetch_attempt_cooldown(monkeypatch: pytest.MonkeyPatch, tmp_path: Path)
 def test_cooldown_stops_crawl(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
     config = _global_config(tmp_path)
-    config.runtime.fail_cooldown_threshold = 1
-    config.runtime.fail_cooldown_seconds = 5
+    config = _with_runtime(config, fail_cooldown_threshold=1, fail_cooldown_seconds=5)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
         run_id="run-cooldown-stop",
@@ -722,7 +728,7 @@ def test_site_crawler_resumes_from_last_product(monkeypatch: pytest.MonkeyPatch,
 
 def test_site_crawler_logs_failed_category(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     site = _site_config()
-    site.pagination.max_pages = 1
+    site = _with_pagination(site, max_pages=1)
     config = _global_config(tmp_path)
     store = StateStore(Path(config.state.database))
     context = RuntimeContext(
@@ -803,3 +809,35 @@ def test_site_crawler_logs_empty_category_once(monkeypatch: pytest.MonkeyPatch,
     content = log_path.read_text(encoding="utf-8")
     assert "reason=empty_after_retries" in content
     store.close()
+
+
+def test_wait_conditions_check_only_selector_conditions(tmp_path: Path) -> None:
+    config = _global_config(tmp_path)
+    store = StateStore(Path(config.state.database))
+    site = _site_config().model_copy(
+        update={
+            "wait_conditions": [
+                WaitCondition(type="delay", value=0.1),
+                WaitCondition(type="selector", value=".product"),
+            ]
+        }
+    )
+    context = RuntimeContext(
+        run_id="run-wait",
+        started_at=datetime.now(timezone.utc),
+        config=config,
+        sites=[site],
+        state_store=store,
+        dry_run=True,
+        resume=False,
+        assets_dir=tmp_path / "assets",
+    )
+
+    crawler = SiteCrawler(context, site)
+    assert crawler._wait_selectors == (".product",)
+    assert crawler._wait_conditions_met("<div class='product'><a href='/p/1'>1</a></div>")
+    assert not crawler._wait_conditions_met("<div class='empty'></div>")
+
+    no_selectors = SiteCrawler(context, _site_config())
+    assert no_selectors._wait_conditions_met("<div></div>")
+    store.close()